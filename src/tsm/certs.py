@@ -1,12 +1,583 @@
 import grp
+import http.client
+import ipaddress
+import json
 import os
 import pwd
+import re
 import shutil
+import socket
+import subprocess
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 
+import yaml
 from loguru import logger
 
+from .utils import YamlLoader, get_available_port
+
+try:
+    from cryptography import x509
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+    from cryptography.x509.oid import ExtendedKeyUsageOID, NameOID
+except ImportError:  # optional: service certs are signed with cfssl instead
+    x509 = None
+
+# Default template contents, written out as cfssl JSON only when a file is missing
+_USAGES_SERVER = ["signing", "key encipherment", "server auth", "client auth"]
+CA_CONFIG_TEMPLATE = {
+    "signing": {
+        "default": {"expiry": "8760h"},
+        "profiles": {
+            "server": {"usages": _USAGES_SERVER, "expiry": "8760h"},
+            "client": {"usages": ["signing", "key encipherment", "client auth"], "expiry": "8760h"},
+            "peer": {"usages": _USAGES_SERVER, "expiry": "8760h"},
+        },
+    }
+}
+CA_CSR_TEMPLATE = {
+    "CN": "FinancialPayments CA",
+    "key": {"algo": "rsa", "size": 2048},
+    "names": [
+        {
+            "C": "US",
+            "L": "San Francisco",
+            "O": "FinancialPayments",
+            "OU": "CA",
+            "ST": "California",
+        }
+    ],
+}
+CSR_TEMPLATE = {
+    "CN": "COMMON_NAME",
+    "hosts": ["HOSTS"],
+    "key": {"algo": "ecdsa", "size": 256},
+    "names": [{"C": "US", "L": "Texas", "O": "etcd", "ST": "California"}],
+}
+
+
+def template_json(template: dict) -> bytes:
+    """Render a default template the way it is stored on disk."""
+    return json.dumps(template, indent=2).encode() + b"\n"
+
+
+_COPY_BUFSIZE = 256 * 1024
+
+
+def _fastcopy(src, dst, mode: int | None = None) -> None:
+    """
+    Copy src to dst (contents and mode bits, like shutil.copy).
+
+    If mode is given, dst gets that mode instead of the source's.
+
+    Uses copy_file_range (reflink/server-side copy on CoW filesystems and NFS)
+    or sendfile when available so the bytes never pass through Python, and
+    falls back to a buffered readinto loop. Like _atomic_write, the copy goes
+    to a temp file that replaces dst, so writing never goes through a hardlink
+    that dst may share and never leaves dst empty or at its old mode.
+    """
+    dst = Path(dst)
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(src, "rb") as fsrc:
+        infd = fsrc.fileno()
+        if mode is None:
+            mode = os.fstat(infd).st_mode & 0o7777
+        outfd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        try:
+            with os.fdopen(outfd, "wb") as fdst:
+                # os.open applies the umask; the copy keeps the exact mode
+                os.fchmod(outfd, mode)
+                _copy_fd(fsrc, fdst)
+            os.replace(tmp, dst)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+def _copy_fd(fsrc, fdst) -> None:
+    """Copy the rest of fsrc into fdst, in-kernel when the platform allows it."""
+    infd, outfd = fsrc.fileno(), fdst.fileno()
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(infd, outfd, 1 << 30):
+                pass
+            return
+        except OSError:
+            pass
+    if hasattr(os, "sendfile"):
+        try:
+            while os.sendfile(outfd, infd, None, 1 << 30):
+                pass
+            return
+        except OSError:
+            pass
+    buf = bytearray(_COPY_BUFSIZE)
+    view = memoryview(buf)
+    while n := fsrc.readinto(buf):
+        fdst.write(view[:n])
+
+
+def _atomic_write(path: Path, data: bytes, mode: int = 0o644) -> None:
+    """
+    Write data to path via a temp file in the same directory and os.replace.
+
+    Concurrent writers never leave a torn file behind, and the file is created
+    with its final mode so keys are never briefly world-readable.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _link_or_copy(src, dst, mode: int | None = None) -> None:
+    """Replace dst with a hardlink to src, copying instead when linking fails (e.g. EXDEV)."""
+    dst = Path(dst)
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        _fastcopy(src, dst, mode)
+
+
+def _ensure_template(path: Path, template: dict, console) -> None:
+    """Write the default template to path if it does not exist yet."""
+    if path.exists():
+        return
+    console.print(f"[yellow]Missing {path}, generating default template...[/yellow]")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _atomic_write(path, template_json(template))
+
+
+def _read_or_create(path: Path, template: dict, console) -> bytes:
+    """Return the contents of path, writing the default template first if it is missing."""
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        _ensure_template(path, template, console)
+        return template_json(template)
+
+
+@lru_cache(maxsize=16)
+def _find_ca(*dirs) -> Path | None:
+    """
+    Return the first directory containing both ca.pem and ca-key.pem, or None.
+
+    Memoized for the life of the process; generate_certs clears the cache
+    whenever it creates a CA.
+    """
+    for d in dirs:
+        try:
+            with os.scandir(d) as entries:
+                names = {entry.name for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        if "ca.pem" in names and "ca-key.pem" in names:
+            return Path(d)
+    return None
+
+
+@lru_cache(maxsize=8)
+def _load_csr_template(path: str, mtime_ns: int) -> dict:
+    """Parse a CSR template; keyed on mtime so edits to the file are picked up."""
+    return json.loads(Path(path).read_bytes())
+
+
+class CfsslServer:
+    """
+    A single long-running `cfssl serve` process used to sign many CSRs.
+
+    Starting cfssl once and POSTing CSRs to its HTTP API avoids forking
+    cfssl + cfssljson for every certificate.
+    """
+
+    def __init__(self, cfssl, ca_pem, ca_key, ca_config, console, timeout=10.0):
+        self.cfssl = cfssl
+        self.ca_pem = Path(ca_pem)
+        self.ca_key = Path(ca_key)
+        self.ca_config = Path(ca_config)
+        self.console = console
+        self.timeout = timeout
+        self.port = None
+        self._process = None
+        self._local = threading.local()
+        self._conns = []
+        self._conns_lock = threading.Lock()
+
+    def start(self) -> bool:
+        """Start `cfssl serve` and wait until it accepts connections."""
+        self.port = get_available_port(8888)
+        if self.port is None:
+            return False
+        self._process = subprocess.Popen(
+            [
+                self.cfssl,
+                "serve",
+                "-address=127.0.0.1",
+                f"-port={self.port}",
+                f"-ca={self.ca_pem}",
+                f"-ca-key={self.ca_key}",
+                f"-config={self.ca_config}",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                return False
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.5).close()
+                return True
+            except OSError:
+                time.sleep(0.05)
+        return False
+
+    def stop(self) -> None:
+        """Close all connections and terminate the server process."""
+        with self._conns_lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns.clear()
+        self._local = threading.local()
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+
+    def _connection(self) -> http.client.HTTPConnection:
+        """Return this thread's keep-alive connection to the server."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    def sign(self, csr_data: dict, profile: str, cert_dir: Path, name: str) -> None:
+        """Issue a certificate for csr_data and write it like `cfssljson -bare` would."""
+        conn = self._connection()
+        body = json.dumps({"request": csr_data, "profile": profile})
+        try:
+            conn.request(
+                "POST",
+                "/api/v1/cfssl/newcert",
+                body=body,
+                headers={"Content-Type": "application/json"},
+            )
+            response = json.loads(conn.getresponse().read())
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            conn.close()
+            self.console.print(f"[red]cfssl serve request failed: {e}[/red]")
+            sys.exit(1)
+        if not response.get("success"):
+            errors = "; ".join(err.get("message", "") for err in response.get("errors", []))
+            self.console.print(f"[red]cfssl newcert failed: {errors}[/red]")
+            sys.exit(1)
+        result = response["result"]
+        _atomic_write(cert_dir / f"{name}.pem", result["certificate"].encode())
+        _atomic_write(cert_dir / f"{name}-key.pem", result["private_key"].encode(), 0o600)
+        if result.get("certificate_request"):
+            _atomic_write(cert_dir / f"{name}.csr", result["certificate_request"].encode())
+
+
+@lru_cache(maxsize=4)
+def _load_ca(pem_path: str, pem_mtime_ns: int, key_path: str, key_mtime_ns: int):
+    """
+    Parse a CA cert/key pair once per process.
+
+    Keyed on both mtimes so a regenerated CA is picked up. The parsed objects
+    are used for signing, so a concurrent rewrite of the files cannot mix an old
+    key with a new cert partway through a run.
+    """
+    cert = x509.load_pem_x509_certificate(Path(pem_path).read_bytes())
+    key = serialization.load_pem_private_key(Path(key_path).read_bytes(), password=None)
+    return cert, key
+
+
+@lru_cache(maxsize=64)
+def _load_cert(path: str, mtime_ns: int):
+    """Parse a PEM certificate; keyed on mtime so a rewritten file is re-read."""
+    return x509.load_pem_x509_certificate(Path(path).read_bytes())
+
+
+def _cert_still_valid(cert_dir: Path, name: str, common_name, hosts, ca_dir: Path, min_days=7):
+    """
+    Return True if {name}.pem and {name}-key.pem in cert_dir can be reused.
+
+    The cert must be signed by the CA in ca_dir, carry common_name, cover every
+    host in its SANs and stay valid for at least min_days. Always False without
+    the optional `cryptography` package.
+    """
+    if x509 is None:
+        return False
+    pem = cert_dir / f"{name}.pem"
+    ca_pem, ca_key = ca_dir / "ca.pem", ca_dir / "ca-key.pem"
+    try:
+        if not (cert_dir / f"{name}-key.pem").is_file():
+            return False
+        cert = _load_cert(str(pem), pem.stat().st_mtime_ns)
+        ca_cert, _ = _load_ca(
+            str(ca_pem), ca_pem.stat().st_mtime_ns, str(ca_key), ca_key.stat().st_mtime_ns
+        )
+        cert.verify_directly_issued_by(ca_cert)
+        san = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+    except (OSError, ValueError, TypeError, InvalidSignature, x509.ExtensionNotFound):
+        return False
+    cns = cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)
+    if not cns or cns[0].value != common_name:
+        return False
+    covered = set(san.get_values_for_type(x509.DNSName))
+    covered.update(str(ip) for ip in san.get_values_for_type(x509.IPAddress))
+    if not covered.issuperset(hosts):
+        return False
+    return cert.not_valid_after_utc - datetime.now(timezone.utc) > timedelta(days=min_days)
+
+
+class CryptoSigner:
+    """
+    Issue service certificates in-process with the `cryptography` package.
+
+    The CA cert/key and ca-config.json are loaded once, so each certificate
+    costs a key generation and a signature instead of forking cfssl.
+    Output matches `cfssljson -bare`: {name}.pem, {name}-key.pem and {name}.csr.
+    """
+
+    _SUBJECT_FIELDS = (
+        ("C", "COUNTRY_NAME"),
+        ("ST", "STATE_OR_PROVINCE_NAME"),
+        ("L", "LOCALITY_NAME"),
+        ("O", "ORGANIZATION_NAME"),
+        ("OU", "ORGANIZATIONAL_UNIT_NAME"),
+    )
+    _KEY_USAGES = {
+        "signing": "digital_signature",
+        "digital signature": "digital_signature",
+        "content commitment": "content_commitment",
+        "key encipherment": "key_encipherment",
+        "data encipherment": "data_encipherment",
+        "key agreement": "key_agreement",
+        "cert sign": "key_cert_sign",
+        "crl sign": "crl_sign",
+    }
+    _EXT_KEY_USAGES = {
+        "server auth": "SERVER_AUTH",
+        "client auth": "CLIENT_AUTH",
+        "code signing": "CODE_SIGNING",
+        "email protection": "EMAIL_PROTECTION",
+        "timestamping": "TIME_STAMPING",
+        "ocsp signing": "OCSP_SIGNING",
+    }
+
+    def __init__(self, ca_pem, ca_key, ca_config):
+        ca_pem, ca_key = Path(ca_pem), Path(ca_key)
+        self.ca_cert, self.ca_key = _load_ca(
+            str(ca_pem), ca_pem.stat().st_mtime_ns, str(ca_key), ca_key.stat().st_mtime_ns
+        )
+        signing = json.loads(Path(ca_config).read_bytes())["signing"]
+        self.default_profile = signing.get("default", {})
+        self.profiles = signing.get("profiles", {})
+        self._aki = x509.AuthorityKeyIdentifier.from_issuer_public_key(self.ca_key.public_key())
+
+    @staticmethod
+    def _parse_expiry(expiry: str) -> timedelta:
+        """Parse a cfssl/Go duration such as "8760h" or "1h30m"."""
+        units = {"h": 3600, "m": 60, "s": 1}
+        parts = re.findall(r"(\d+(?:\.\d+)?)([hms])", expiry)
+        if not parts:
+            raise ValueError(f"Unsupported expiry: {expiry!r}")
+        return timedelta(seconds=sum(float(n) * units[u] for n, u in parts))
+
+    @staticmethod
+    def _generate_key(key_spec: dict):
+        algo = key_spec.get("algo", "ecdsa")
+        size = int(key_spec.get("size", 256))
+        if algo == "rsa":
+            return rsa.generate_private_key(public_exponent=65537, key_size=size)
+        curves = {256: ec.SECP256R1, 384: ec.SECP384R1, 521: ec.SECP521R1}
+        if algo != "ecdsa" or size not in curves:
+            raise ValueError(f"Unsupported key: {algo} {size}")
+        return ec.generate_private_key(curves[size]())
+
+    def _subject(self, csr_data: dict):
+        attrs = []
+        for names in csr_data.get("names", []):
+            for field, oid in self._SUBJECT_FIELDS:
+                if names.get(field):
+                    attrs.append(x509.NameAttribute(getattr(NameOID, oid), names[field]))
+        if csr_data.get("CN"):
+            attrs.append(x509.NameAttribute(NameOID.COMMON_NAME, csr_data["CN"]))
+        return x509.Name(attrs)
+
+    @staticmethod
+    def _san(hosts):
+        names = []
+        for host in hosts:
+            try:
+                names.append(x509.IPAddress(ipaddress.ip_address(host)))
+            except ValueError:
+                names.append(x509.DNSName(host))
+        return x509.SubjectAlternativeName(names)
+
+    def sign(self, csr_data: dict, profile: str, cert_dir: Path, name: str) -> None:
+        """Issue a certificate for csr_data and write it like `cfssljson -bare` would."""
+        policy = self.profiles.get(profile, self.default_profile)
+        usages = policy.get("usages", self.default_profile.get("usages", []))
+        expiry = self._parse_expiry(
+            policy.get("expiry", self.default_profile.get("expiry", "8760h"))
+        )
+
+        key = self._generate_key(csr_data.get("key", {}))
+        subject = self._subject(csr_data)
+        hosts = csr_data.get("hosts", [])
+        san = self._san(hosts) if hosts else None
+
+        csr_builder = x509.CertificateSigningRequestBuilder().subject_name(subject)
+        if san is not None:
+            csr_builder = csr_builder.add_extension(san, critical=False)
+        csr = csr_builder.sign(key, hashes.SHA256())
+
+        flags = dict.fromkeys(set(self._KEY_USAGES.values()), False)
+        flags.update(encipher_only=False, decipher_only=False)
+        for usage in usages:
+            if usage in self._KEY_USAGES:
+                flags[self._KEY_USAGES[usage]] = True
+        ext_usages = [
+            getattr(ExtendedKeyUsageOID, self._EXT_KEY_USAGES[u])
+            for u in usages
+            if u in self._EXT_KEY_USAGES
+        ]
+
+        # Backdate slightly for clock skew, as cfssl does
+        now = datetime.now(timezone.utc) - timedelta(minutes=5)
+        builder = (
+            x509.CertificateBuilder()
+            .subject_name(subject)
+            .issuer_name(self.ca_cert.subject)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now)
+            .not_valid_after(now + expiry)
+            .add_extension(x509.BasicConstraints(ca=False, path_length=None), critical=True)
+            .add_extension(x509.KeyUsage(**flags), critical=True)
+            .add_extension(
+                x509.SubjectKeyIdentifier.from_public_key(key.public_key()), critical=False
+            )
+            .add_extension(self._aki, critical=False)
+        )
+        if ext_usages:
+            builder = builder.add_extension(x509.ExtendedKeyUsage(ext_usages), critical=False)
+        if san is not None:
+            builder = builder.add_extension(san, critical=False)
+        cert = builder.sign(self.ca_key, hashes.SHA256())
+
+        key_pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption(),
+        )
+        _atomic_write(cert_dir / f"{name}.pem", cert.public_bytes(serialization.Encoding.PEM))
+        _atomic_write(cert_dir / f"{name}-key.pem", key_pem, 0o600)
+        _atomic_write(cert_dir / f"{name}.csr", csr.public_bytes(serialization.Encoding.PEM))
+
+
+@contextmanager
+def cert_signer(output_dir, cert_config_dir, console):
+    """
+    Provide a signer for service certificates for the duration of the block.
+
+    Prefers the in-process CryptoSigner when `cryptography` is installed,
+    otherwise runs a `cfssl serve` instance. Yields None when the CA/config
+    files or the cfssl binary are missing or the server fails to start;
+    callers then fall back to forking cfssl per certificate.
+    """
+    cfssl = shutil.which("cfssl")
+    output_dir = Path(output_dir)
+    ca_pem = output_dir / "ca.pem"
+    ca_key = output_dir / "ca-key.pem"
+    ca_config = Path(cert_config_dir) / "ca-config.json"
+    if _find_ca(output_dir) is None:
+        yield None
+        return
+    _ensure_template(ca_config, CA_CONFIG_TEMPLATE, console)
+    if x509 is not None:
+        try:
+            signer = CryptoSigner(ca_pem, ca_key, ca_config)
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Could not load CA for in-process signing ({e}), using cfssl")
+        else:
+            yield signer
+            return
+    if not cfssl:
+        yield None
+        return
+    server = CfsslServer(cfssl, ca_pem, ca_key, ca_config, console)
+    try:
+        if not server.start():
+            logger.warning("cfssl serve did not start, falling back to cfssl gencert")
+            server.stop()
+            yield None
+            return
+        yield server
+    finally:
+        server.stop()
+
+
+def _cfssl_pipeline(cfssl_cmd: list, csr: bytes, cfssljson: str, bare: Path, console) -> None:
+    """
+    Run `cfssl ... | cfssljson -bare <bare>` with the CSR fed on cfssl's stdin.
+
+    The two processes are connected by an OS pipe, so the PEM output never
+    passes through Python. Exits on failure of either side.
+    """
+    # cfssl logs to stderr while cfssljson is still reading its stdout; a file
+    # can't fill up and stall it the way an undrained pipe could.
+    with tempfile.TemporaryFile() as cfssl_err:
+        p1 = subprocess.Popen(
+            cfssl_cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=cfssl_err
+        )
+        p2 = subprocess.Popen(
+            [cfssljson, "-bare", str(bare)],
+            stdin=p1.stdout,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        p1.stdout.close()  # cfssljson owns the read end now
+        try:
+            p1.stdin.write(csr)
+        except BrokenPipeError:
+            pass
+        finally:
+            p1.stdin.close()
+        err2 = p2.communicate()[1]
+        p1.wait()
+        cfssl_err.seek(0)
+        err1 = cfssl_err.read()
+    if p1.returncode != 0:
+        console.print(f"[red]cfssl gencert failed: {err1.decode(errors='replace')}[/red]")
+        sys.exit(1)
+    if p2.returncode != 0:
+        console.print(f"[red]cfssljson failed: {err2.decode(errors='replace')}[/red]")
+        sys.exit(1)
+
 
 def generate_certs(
     type,
@@ -19,6 +590,8 @@ def generate_certs(
     domain,
     console,
     source_file=None,
+    signer=None,
+    ca_dir=None,
 ):
     """
     Generate CA or service certificates using cfssl/cfssljson (replaces gen-certs.sh).
@@ -26,16 +599,16 @@ def generate_certs(
         type: 'ca', 'server', 'client', or 'peer'
         name: Name for the certificate files
         common_name: Common Name (CN) for the certificate
-        hosts: Comma-separated list of hosts for the cert
+        hosts: Comma-separated list of hosts for the cert, or a sequence of hosts
         output_dir: Directory to write certs to
         cert_config_dir: Directory containing ca-csr.json, ca-config.json, csr-template.json
         profile: cfssl profile to use
         domain: Domain for wildcard certs
         console: rich.console.Console instance for output
         source_file: Optional path to existing certificate file to use instead of generating new one
+        signer: Optional running CfsslServer used to sign service certs instead of forking cfssl
+        ca_dir: Directory holding ca.pem/ca-key.pem for service certs (default: output_dir)
     """
-    import json
-    import subprocess
 
     output_dir = Path(output_dir)
     cert_config_dir = Path(cert_config_dir)
@@ -60,21 +633,21 @@ def generate_certs(
 
         # Check if both cert and key exist
         if source_pem_path.exists() and source_key_path.exists():
-            shutil.copy(source_pem_path, target_path)
-            shutil.copy(source_key_path, target_key_path)
+            _fastcopy(source_pem_path, target_path)
+            _fastcopy(source_key_path, target_key_path)
             console.print(
                 f"[green]✓ Copied existing certificate and key from {base_name} to {target_path}[/green]"
             )
             return
         # If only cert exists but no key
         elif source_pem_path.exists():
-            shutil.copy(source_pem_path, target_path)
+            _fastcopy(source_pem_path, target_path)
             console.print(
                 f"[yellow]Warning: Certificate exists but key file {source_key_path} not found. Generating new key...[/yellow]"
             )
         # If only key exists but no cert
         elif source_key_path.exists():
-            shutil.copy(source_key_path, target_key_path)
+            _fastcopy(source_key_path, target_key_path)
             console.print(
                 f"[yellow]Warning: Key exists but certificate file {source_pem_path} not found. Generating new certificate...[/yellow]"
             )
@@ -86,81 +659,65 @@ def generate_certs(
 
     cfssl = shutil.which("cfssl")
     cfssljson = shutil.which("cfssljson")
-    if not cfssl or not cfssljson:
+    if (type == "ca" or signer is None) and (not cfssl or not cfssljson):
         console.print("[red]cfssl and cfssljson must be installed and in PATH[/red]")
         sys.exit(1)
 
-    # Default template contents
-    ca_config_content = '{\n  "signing": {\n    "default": {\n      "expiry": "8760h"\n    },\n    "profiles": {\n      "server": {\n        "usages": [\n          "signing",\n          "key encipherment",\n          "server auth",\n          "client auth"\n        ],\n        "expiry": "8760h"\n      },\n      "client": {\n        "usages": [\n          "signing",\n          "key encipherment",\n          "client auth"\n        ],\n        "expiry": "8760h"\n      },\n      "peer": {\n        "usages": [\n          "signing",\n          "key encipherment",\n          "server auth",\n          "client auth"\n        ],\n        "expiry": "8760h"\n      }\n    }\n  }\n}\n'
-    ca_csr_content = '{\n  "CN": "FinancialPayments CA",\n  "key": {\n    "algo": "rsa",\n    "size": 2048\n  },\n  "names": [\n    {\n      "C": "US",\n      "L": "San Francisco",\n      "O": "FinancialPayments",\n      "OU": "CA",\n      "ST": "California"\n    }\n  ]\n}\n'
-    csr_template_content = '{\n  "CN": "COMMON_NAME",\n  "hosts": [\n    "HOSTS"\n  ],\n  "key": {\n    "algo": "ecdsa",\n    "size": 256\n  },\n  "names": [\n    {\n      "C": "US",\n      "L": "Texas",\n      "O": "etcd",\n      "ST": "California"\n    }\n  ]\n}\n'
-
     if type == "ca":
         ca_csr = cert_config_dir / "ca-csr.json"
-        if not ca_csr.exists():
-            console.print(f"[yellow]Missing {ca_csr}, generating default template...[/yellow]")
-            ca_csr.parent.mkdir(parents=True, exist_ok=True)
-            with open(ca_csr, "w") as f:
-                f.write(ca_csr_content)
+        ca_csr_bytes = _read_or_create(ca_csr, CA_CSR_TEMPLATE, console)
         console.print(f"[blue]Generating CA in {output_dir}...[/blue]")
-        with (output_dir / "ca-csr.json").open("w") as f:
-            f.write(ca_csr.read_text())
-        p1 = subprocess.run(
-            [cfssl, "gencert", "-initca", str(ca_csr)], capture_output=True, text=True
-        )
-        if p1.returncode != 0:
-            console.print(f"[red]cfssl gencert failed: {p1.stderr}[/red]")
-            sys.exit(1)
-        p2 = subprocess.run(
-            [cfssljson, "-bare", str(output_dir / "ca")],
-            input=p1.stdout,
-            capture_output=True,
-            text=True,
+        # Keep a copy of the CSR next to the CA, but hand cfssl the in-memory bytes
+        _atomic_write(output_dir / "ca-csr.json", ca_csr_bytes)
+        _cfssl_pipeline(
+            [cfssl, "gencert", "-initca", "-"],
+            ca_csr_bytes,
+            cfssljson,
+            output_dir / "ca",
+            console,
         )
-        if p2.returncode != 0:
-            console.print(f"[red]cfssljson failed: {p2.stderr}[/red]")
-            sys.exit(1)
+        _find_ca.cache_clear()
         console.print(f"[green]✓ CA generated in {output_dir}[/green]")
         return
 
     # For service certs: create a CSR JSON from template
     csr_template = cert_config_dir / "csr-template.json"
-    if not csr_template.exists():
-        console.print(f"[yellow]Missing {csr_template}, generating default template...[/yellow]")
-        csr_template.parent.mkdir(parents=True, exist_ok=True)
-        with open(csr_template, "w") as f:
-            f.write(csr_template_content)
-    hosts_list = [h.strip() for h in hosts.split(",") if h.strip()]
-    with csr_template.open() as f:
-        csr_data = json.load(f)
-    csr_data["CN"] = common_name
-    csr_data["hosts"] = hosts_list
-    csr_path = cert_dir / f"{name}-csr.json"
-    with csr_path.open("w") as f:
-        json.dump(csr_data, f, indent=2)
+    try:
+        template = _load_csr_template(str(csr_template), csr_template.stat().st_mtime_ns)
+    except FileNotFoundError:
+        _ensure_template(csr_template, CSR_TEMPLATE, console)
+        template = CSR_TEMPLATE
+    if isinstance(hosts, str):
+        hosts_list = [h.strip() for h in hosts.split(",") if h.strip()]
+    else:
+        hosts_list = list(hosts)
+    csr_data = {**template, "CN": common_name, "hosts": hosts_list}
 
     # Look for CA files in the root certs directory
-    ca_pem = output_dir / "ca.pem"
-    ca_key = output_dir / "ca-key.pem"
+    ca_dir = Path(ca_dir) if ca_dir else output_dir
+    if _cert_still_valid(cert_dir, name, common_name, hosts_list, ca_dir):
+        console.print(
+            f"[green]✓ Certificate for {name} in {cert_dir} is still valid, skipping[/green]"
+        )
+        return
+
+    if signer is not None:
+        console.print(f"[blue]Generating certificate for {name} in {cert_dir}...[/blue]")
+        signer.sign(csr_data, profile, cert_dir, name)
+        console.print(f"[green]✓ Certificate for {name} generated in {cert_dir}[/green]")
+        return
+
+    ca_pem = ca_dir / "ca.pem"
+    ca_key = ca_dir / "ca-key.pem"
 
-    if not ca_pem.exists() or not ca_key.exists():
-        ca_config = cert_config_dir / "ca-config.json"
-        if not ca_config.exists():
-            console.print(f"[yellow]Missing {ca_config}, generating default template...[/yellow]")
-            ca_config.parent.mkdir(parents=True, exist_ok=True)
-            with open(ca_config, "w") as f:
-                f.write(ca_config_content)
+    ca_config = cert_config_dir / "ca-config.json"
+    _ensure_template(ca_config, CA_CONFIG_TEMPLATE, console)
+    if _find_ca(ca_dir) is None:
         console.print("[red]CA files not found. Generate CA first with --type ca.[/red]")
         sys.exit(1)
 
-    ca_config = cert_config_dir / "ca-config.json"
-    if not ca_config.exists():
-        console.print(f"[yellow]Missing {ca_config}, generating default template...[/yellow]")
-        ca_config.parent.mkdir(parents=True, exist_ok=True)
-        with open(ca_config, "w") as f:
-            f.write(ca_config_content)
     console.print(f"[blue]Generating certificate for {name} in {cert_dir}...[/blue]")
-    p1 = subprocess.run(
+    _cfssl_pipeline(
         [
             cfssl,
             "gencert",
@@ -168,26 +725,19 @@ def generate_certs(
             f"-ca-key={ca_key}",
             f"-config={ca_config}",
             f"-profile={profile}",
-            str(csr_path),
+            "-",
         ],
-        capture_output=True,
-        text=True,
+        json.dumps(csr_data, separators=(",", ":")).encode(),
+        cfssljson,
+        cert_dir / name,
+        console,
     )
-    if p1.returncode != 0:
-        console.print(f"[red]cfssl gencert failed: {p1.stderr}[/red]")
-        sys.exit(1)
-    p2 = subprocess.run(
-        [cfssljson, "-bare", str(cert_dir / name)],
-        input=p1.stdout,
-        capture_output=True,
-        text=True,
-    )
-    if p2.returncode != 0:
-        console.print(f"[red]cfssljson failed: {p2.stderr}[/red]")
-        sys.exit(1)
     console.print(f"[green]✓ Certificate for {name} generated in {cert_dir}[/green]")
 
 
+_CERT_SUFFIXES = frozenset({"pem", "crt", "key"})
+
+
 def copy_certs(from_dir, to_dir, console):
     """
     Copy certificates from one directory to another if they exist.
@@ -199,14 +749,20 @@ def copy_certs(from_dir, to_dir, console):
     from_dir = Path(from_dir)
     to_dir = Path(to_dir)
     to_dir.mkdir(parents=True, exist_ok=True)
-    files = (
-        list(from_dir.glob("*.pem")) + list(from_dir.glob("*.crt")) + list(from_dir.glob("*.key"))
-    )
+    with os.scandir(from_dir) as entries:
+        files = sorted(
+            (
+                Path(e.path)
+                for e in entries
+                if e.name.rpartition(".")[2] in _CERT_SUFFIXES and e.is_file()
+            ),
+            key=lambda f: f.name,
+        )
     if not files:
         console.print(f"[yellow]No cert files found in {from_dir}[/yellow]")
         return
     for f in files:
-        shutil.copy(f, to_dir / f.name)
+        _fastcopy(f, to_dir / f.name)
         console.print(f"[green]Copied {f.name} to {to_dir}[/green]")
 
 
@@ -215,77 +771,75 @@ def generate_bundle(bundle, output_dir, cert_config_dir, hosts, domain, common_n
     Generate a bundle of certs for a specific use case (e.g., traefik).
     Currently supports: traefik
     """
-    import shutil
-    from pathlib import Path
-
-    from .certs import generate_certs as generate_certs_func
-
     if bundle == "traefik":
-        traefik_dir = Path(output_dir) / "traefik"
-        traefik_dir.mkdir(parents=True, exist_ok=True)
         base_cert_dir = Path(output_dir)
+        cert_config_dir = Path(cert_config_dir)
+        traefik_dir = base_cert_dir / "traefik"
+        traefik_dir.mkdir(parents=True, exist_ok=True)
         ca_pem = base_cert_dir / "ca.pem"
         ca_key = base_cert_dir / "ca-key.pem"
-        # Debug print for CA file locations
-        print(f"[DEBUG] Looking for CA at {ca_pem} and {ca_key}")
+        logger.debug(f"Looking for CA at {ca_pem} and {ca_key}")
         # Generate CA if missing
-        if not ca_pem.exists() or not ca_key.exists():
-            generate_certs_func(
+        if _find_ca(base_cert_dir) is None:
+            generate_certs(
                 "ca",
                 "ca",
                 common_name,
                 hosts,
-                str(base_cert_dir),
+                base_cert_dir,
                 cert_config_dir,
                 "server",
                 domain,
                 console,
             )
-        # traefik-server
-        generate_certs_func(
-            "server",
-            "traefik-server",
-            "traefik",
-            f"localhost,127.0.0.1,traefik,{domain},*.{domain}",
-            str(traefik_dir),
-            cert_config_dir,
-            "server",
-            domain,
-            console,
-        )
-        # asterisk
-        generate_certs_func(
-            "server",
-            "asterisk",
-            "asterisk",
-            f"localhost,127.0.0.1,traefik,asterisk,{domain},*.{domain}",
-            str(traefik_dir),
-            cert_config_dir,
-            "server",
-            domain,
-            console,
-        )
-        # Copy/rename asterisk.pem to asterisk_fp.pem and asterisk-key.pem to asterisk_fp-key.pem
-        asterisk_pem = traefik_dir / "asterisk.pem"
-        asterisk_key = traefik_dir / "asterisk-key.pem"
-        asterisk_fp_pem = traefik_dir / "asterisk_fp.pem"
-        asterisk_fp_key = traefik_dir / "asterisk_fp-key.pem"
-        if asterisk_pem.exists():
-            shutil.copy(asterisk_pem, asterisk_fp_pem)
-        if asterisk_key.exists():
-            shutil.copy(asterisk_key, asterisk_fp_key)
-        # wildcard_herringbank
-        generate_certs_func(
-            "server",
-            "wildcard_herringbank",
-            "wildcard_herringbank",
-            f"localhost,127.0.0.1,traefik,herringbank,{domain},*.{domain}",
-            str(traefik_dir),
-            cert_config_dir,
-            "server",
-            domain,
-            console,
-        )
+        _ensure_template(cert_config_dir / "csr-template.json", CSR_TEMPLATE, console)
+        _ensure_template(cert_config_dir / "ca-config.json", CA_CONFIG_TEMPLATE, console)
+        # (name, common name, hosts) for each cert in the bundle
+        local_hosts = ("localhost", "127.0.0.1", "traefik")
+        domain_hosts = (domain, f"*.{domain}")
+        jobs = [
+            ("traefik-server", "traefik", local_hosts + domain_hosts),
+            ("asterisk", "asterisk", local_hosts + ("asterisk",) + domain_hosts),
+            (
+                "wildcard_herringbank",
+                "wildcard_herringbank",
+                local_hosts + ("herringbank",) + domain_hosts,
+            ),
+        ]
+        with cert_signer(base_cert_dir, cert_config_dir, console) as signer:
+
+            def generate_job(job):
+                cert_name, cert_common_name, cert_hosts = job
+                # Buffer this cert's output (rich buffers per thread) and write it once
+                with console:
+                    generate_certs(
+                        "server",
+                        cert_name,
+                        cert_common_name,
+                        cert_hosts,
+                        traefik_dir,
+                        cert_config_dir,
+                        "server",
+                        domain,
+                        console,
+                        signer=signer,
+                        ca_dir=base_cert_dir,
+                    )
+
+            # The certs only depend on the CA, so issue them concurrently
+            with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+                list(executor.map(generate_job, jobs))
+        # Expose asterisk.pem/asterisk-key.pem as asterisk_fp.pem/asterisk_fp-key.pem,
+        # hardlinked since the content is identical. copy_prod_certs_if_present later
+        # overwrites the asterisk_fp files, so every writer must replace the path
+        # (_fastcopy, _atomic_write) rather than truncate the shared inode.
+        asterisk_dir = traefik_dir / "asterisk"
+        for src, dst in (
+            (asterisk_dir / "asterisk.pem", traefik_dir / "asterisk_fp.pem"),
+            (asterisk_dir / "asterisk-key.pem", traefik_dir / "asterisk_fp-key.pem"),
+        ):
+            if src.exists():
+                _link_or_copy(src, dst)
         console.print("[green]✓ Traefik cert bundle generated in proxy/certs/traefik[green]")
 
 
@@ -295,9 +849,6 @@ def generate_certs_cli(
     """
     Main entry for CLI cert generation. Handles --type, --bundle, and all CA file logic.
     """
-    import shutil
-    from pathlib import Path
-
     if bundle == "traefik":
         generate_bundle(
             bundle,
@@ -315,94 +866,82 @@ def generate_certs_cli(
             style="red",
         )
         return
+    output_dir = Path(output_dir)
+    cert_config_dir = Path(cert_config_dir)
     if type == "all" or not type:
         # Generate CA in the base cert directory
         ca_name = name if name else "ca"
-        ca_dir = Path(output_dir)
+        ca_dir = output_dir
         ca_dir.mkdir(parents=True, exist_ok=True)
         generate_certs(
             "ca",
             ca_name,
             common_name,
             hosts,
-            str(ca_dir),
+            ca_dir,
             cert_config_dir,
             profile,
             domain,
             console,
         )
-        ca_pem = ca_dir / "ca.pem"
-        ca_key = ca_dir / "ca-key.pem"
-        for t in ["server", "client", "peer"]:
-            cert_name = name if name else t
-            out_dir = Path(output_dir) / t
-            out_dir.mkdir(parents=True, exist_ok=True)
-            # Copy CA files in
-            ca_pem_target = out_dir / "ca.pem"
-            ca_key_target = out_dir / "ca-key.pem"
-            shutil.copy(ca_pem, ca_pem_target)
-            shutil.copy(ca_key, ca_key_target)
-            try:
-                generate_certs(
-                    t,
-                    cert_name,
-                    common_name,
-                    hosts,
-                    str(out_dir),
-                    cert_config_dir,
-                    profile,
-                    domain,
-                    console,
-                )
-            finally:
-                # Remove CA files from subdir
-                if ca_pem_target.exists():
-                    ca_pem_target.unlink()
-                if ca_key_target.exists():
-                    ca_key_target.unlink()
+        _ensure_template(cert_config_dir / "csr-template.json", CSR_TEMPLATE, console)
+        _ensure_template(cert_config_dir / "ca-config.json", CA_CONFIG_TEMPLATE, console)
+        with cert_signer(ca_dir, cert_config_dir, console) as signer:
+
+            def generate_type(t: str) -> None:
+                out_dir = output_dir / t
+                out_dir.mkdir(parents=True, exist_ok=True)
+                # Flush each cert's messages in one write, as in generate_bundle
+                with console:
+                    generate_certs(
+                        t,
+                        name if name else t,
+                        common_name,
+                        hosts,
+                        out_dir,
+                        cert_config_dir,
+                        profile,
+                        domain,
+                        console,
+                        signer=signer,
+                        ca_dir=ca_dir,
+                    )
+
+            # Each type writes to its own subdirectory, so they can be issued together
+            types = ["server", "client", "peer"]
+            with ThreadPoolExecutor(max_workers=min(len(types), os.cpu_count() or 1)) as executor:
+                list(executor.map(generate_type, types))
     else:
         cert_name = name if name else type
-        if type == "ca":
-            out_dir = Path(output_dir)
-        else:
-            out_dir = Path(output_dir) / type
+        out_dir = output_dir if type == "ca" else output_dir / type
         out_dir.mkdir(parents=True, exist_ok=True)
-        # If not CA, copy CA files in, generate, then remove
+        # If not CA, sign with the CA in the base cert directory
         if type != "ca":
-            ca_dir = Path(output_dir)
-            ca_pem = ca_dir / "ca.pem"
-            ca_key = ca_dir / "ca-key.pem"
-            ca_pem_target = out_dir / "ca.pem"
-            ca_key_target = out_dir / "ca-key.pem"
-            if not ca_pem.exists() or not ca_key.exists():
+            ca_dir = output_dir
+            if _find_ca(ca_dir) is None:
                 console.print("[red]CA files not found. Generate CA first with --type ca.[/red]")
                 sys.exit(1)
-            shutil.copy(ca_pem, ca_pem_target)
-            shutil.copy(ca_key, ca_key_target)
-            try:
+            with cert_signer(ca_dir, cert_config_dir, console) as signer:
                 generate_certs(
                     type,
                     cert_name,
                     common_name,
                     hosts,
-                    str(out_dir),
+                    out_dir,
                     cert_config_dir,
                     profile,
                     domain,
                     console,
+                    signer=signer,
+                    ca_dir=ca_dir,
                 )
-            finally:
-                if ca_pem_target.exists():
-                    ca_pem_target.unlink()
-                if ca_key_target.exists():
-                    ca_key_target.unlink()
         else:
             generate_certs(
                 type,
                 cert_name,
                 common_name,
                 hosts,
-                str(out_dir),
+                out_dir,
                 cert_config_dir,
                 profile,
                 domain,
@@ -433,16 +972,87 @@ def copy_prod_certs_if_present():
             "proxy/certs/traefik/wildcard_herringbank_com-key.pem",
         ),
     ]
+    # Group destinations by source so each source file is read only once
+    groups: dict[str, list[str]] = {}
     for src, dst in mappings:
-        src_path = Path(src)
-        dst_path = Path(dst)
-        try:
-            if src_path.exists():
+        groups.setdefault(src, []).append(dst)
+
+    def copy_group(group: tuple[str, list[str]]) -> None:
+        src_path = Path(group[0])
+        if not src_path.exists():
+            return
+        # Modes follow policy rather than whatever /usr/local/certs happens to use
+        is_key = src_path.name.endswith((".key", "-key.pem"))
+        mode = 0o600 if is_key else 0o644
+        first_dst = None
+        for dst in group[1]:
+            dst_path = Path(dst)
+            try:
                 dst_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy(src_path, dst_path)
+                if first_dst is None:
+                    _fastcopy(src_path, dst_path, mode)
+                    first_dst = dst_path
+                else:
+                    # Fan duplicates out from the first copy, hardlinking when possible
+                    _link_or_copy(first_dst, dst_path, mode)
                 logger.info(f"Copied {src_path} -> {dst_path}")
-        except Exception as e:
-            logger.warning(f"Could not copy {src_path} -> {dst_path}: {e}")
+            except Exception as e:
+                logger.warning(f"Could not copy {src_path} -> {dst_path}: {e}")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(copy_group, groups.items()))
+
+
+# NSS lookups can be slow (LDAP/SSSD), and set_file_permissions is called per file
+@lru_cache(maxsize=128)
+def _uid_of(name: str) -> int | None:
+    """Return the uid for a user name, or None if the user does not exist."""
+    try:
+        return pwd.getpwnam(name).pw_uid
+    except KeyError:
+        return None
+
+
+@lru_cache(maxsize=128)
+def _gid_of(name: str) -> int | None:
+    """Return the gid for a group name, or None if the group does not exist."""
+    try:
+        return grp.getgrnam(name).gr_gid
+    except KeyError:
+        return None
+
+
+# Fallback owner/group for set_file_permissions; tsm never changes its own ids
+_UID = os.getuid()
+_GID = os.getgid()
+
+
+@lru_cache(maxsize=1)
+def _current_user_name() -> str:
+    """Return the name of the current user (only needed for warnings)."""
+    return pwd.getpwuid(_UID).pw_name
+
+
+@lru_cache(maxsize=1)
+def _current_group_name() -> str:
+    """Return the name of the current group (only needed for warnings)."""
+    return grp.getgrgid(_GID).gr_name
+
+
+# Octal mode strings such as "644", "0644" or "0o644"
+_MODE_RE = re.compile(r"^(?:0[oO])?([0-7]+)$")
+
+
+@lru_cache(maxsize=32)
+def _parse_mode(mode, default: int = 0o644) -> int:
+    """Convert a permissions mode from the config (int or octal string) to an int."""
+    if mode is None:
+        return default
+    if not isinstance(mode, str):
+        return int(mode)
+    mode = mode.strip()
+    match = _MODE_RE.match(mode)
+    return int(match.group(1), 8) if match else int(mode)
 
 
 def set_file_permissions(file_path: Path, permissions: dict | None) -> None:
@@ -465,22 +1075,8 @@ def set_file_permissions(file_path: Path, permissions: dict | None) -> None:
     if not permissions:
         return
 
-    import os
-
     try:
-        # Convert mode to integer if it's a string
-        mode = permissions.get("mode")
-        if mode is not None:
-            if isinstance(mode, str):
-                # Handle string octal values (e.g., "644" or "0o644")
-                if mode.startswith("0o"):
-                    mode = int(mode, 8)
-                else:
-                    mode = int(mode, 8) if mode.isdigit() else int(mode)
-            else:
-                mode = int(mode)
-        else:
-            mode = 0o644  # Default mode if not specified
+        mode = _parse_mode(permissions.get("mode"))
 
         # Set file permissions
         os.chmod(file_path, mode)
@@ -489,24 +1085,20 @@ def set_file_permissions(file_path: Path, permissions: dict | None) -> None:
         owner = permissions.get("owner")
         group = permissions.get("group")
         if owner is not None or group is not None:
-            # Get current user/group as fallback
-            current_uid = os.getuid()
-            current_gid = os.getgid()
-            current_user = pwd.getpwuid(current_uid).pw_name
-            current_group = grp.getgrgid(current_gid).gr_name
-
             # Try to get specified owner/group, fall back to current if not found
-            try:
-                uid = pwd.getpwnam(owner).pw_uid if owner else current_uid
-            except KeyError:
-                logger.warning(f"User '{owner}' not found, using current user '{current_user}'")
-                uid = current_uid
+            uid = _uid_of(owner) if owner else _UID
+            if uid is None:
+                logger.warning(
+                    f"User '{owner}' not found, using current user '{_current_user_name()}'"
+                )
+                uid = _UID
 
-            try:
-                gid = grp.getgrnam(group).gr_gid if group else current_gid
-            except KeyError:
-                logger.warning(f"Group '{group}' not found, using current group '{current_group}'")
-                gid = current_gid
+            gid = _gid_of(group) if group else _GID
+            if gid is None:
+                logger.warning(
+                    f"Group '{group}' not found, using current group '{_current_group_name()}'"
+                )
+                gid = _GID
 
             os.chown(file_path, uid, gid)
 
@@ -529,10 +1121,11 @@ def generate_certs_from_config(
     """
     Generate certificates based on configuration file.
     """
-    import yaml
-
-    with open(config_path) as f:
-        config = yaml.safe_load(f)
+    # Binary mode lets libyaml decode the stream itself
+    with open(config_path, "rb") as f:
+        config = yaml.load(f, Loader=YamlLoader)
+    output_dir = Path(output_dir)
+    cert_config_dir = Path(cert_config_dir)
 
     # Get values from config, CLI args, or environment variables
     defaults = config.get("defaults", {})
@@ -567,7 +1160,20 @@ def generate_certs_from_config(
         )
 
     # Generate individual certificates
+    _ensure_template(cert_config_dir / "csr-template.json", CSR_TEMPLATE, console)
+    _ensure_template(cert_config_dir / "ca-config.json", CA_CONFIG_TEMPLATE, console)
+    # Index by name once; a later entry with the same name overrides an earlier
+    # one, which also keeps two workers from writing into the same directory.
+    certs_by_name = {}
     for cert in config.get("certificates", []):
+        if cert["name"] in certs_by_name:
+            logger.warning(f"Duplicate certificate name {cert['name']}, using the last entry")
+            console.print(
+                f"[yellow]Duplicate certificate name {cert['name']}, using the last entry[/yellow]"
+            )
+        certs_by_name[cert["name"]] = cert
+
+    def generate_cert(cert: dict, signer=None) -> None:
         cert_name = cert["name"]
         cert_type = cert["type"]
         cert_common_name = cert.get("common_name", common_name)
@@ -576,23 +1182,40 @@ def generate_certs_from_config(
         cert_domain = cert.get("domain", domain)
         source_file = cert.get("source_file")
 
-        # Set permissions if specified
+        # Rich buffers per thread, so each cert's messages come out together
+        with console:
+            generate_certs(
+                cert_type,
+                cert_name,
+                cert_common_name,
+                cert_hosts,
+                output_dir,
+                cert_config_dir,
+                cert_profile,
+                cert_domain,
+                console,
+                source_file,
+                signer=signer,
+            )
+
+        # Apply permissions to the cert and key that were just written
         permissions = cert.get("permissions")
         if permissions:
-            cert_dir = Path(output_dir) / cert_name
-            cert_dir.mkdir(parents=True, exist_ok=True)
-            for file in cert_dir.glob("*"):
-                set_file_permissions(file, permissions)
+            # Resolve the mode once per cert rather than once per file
+            permissions = {**permissions, "mode": _parse_mode(permissions.get("mode"))}
+            cert_dir = output_dir / cert_name
+            for suffix in (".pem", "-key.pem"):
+                path = cert_dir / f"{cert_name}{suffix}"
+                if path.exists():
+                    set_file_permissions(path, permissions)
 
-        generate_certs(
-            cert_type,
-            cert_name,
-            cert_common_name,
-            cert_hosts,
-            output_dir,
-            cert_config_dir,
-            cert_profile,
-            cert_domain,
-            console,
-            source_file,
-        )
+    # CA entries write the CA that the signer loads, so they must exist before it
+    # is opened; only service certificates are issued concurrently
+    for cert in certs_by_name.values():
+        if cert["type"] == "ca":
+            generate_cert(cert)
+    service_certs = [cert for cert in certs_by_name.values() if cert["type"] != "ca"]
+    if service_certs:
+        with cert_signer(output_dir, cert_config_dir, console) as signer:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                list(executor.map(lambda cert: generate_cert(cert, signer), service_certs))
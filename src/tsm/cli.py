@@ -5,25 +5,30 @@ Traefik Service Manager (TSM) - CLI Interface
 A modern service discovery and auto-scaling tool for Traefik with Docker.
 """
 
-import logging
+import hashlib
+import json
 import os
+import pickle
+import re
+import subprocess
 import sys
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
 import click
+import yaml
 from dotenv import load_dotenv
 from loguru import logger
 from rich.console import Console
 from rich.table import Table
 
-from .certs import copy_certs as copy_certs_func
 from .config import Config, load_config
-from .discovery import ServiceDiscovery
-from .docker_client import DockerManager
-from .generator import ConfigGenerator
-from .monitoring import PrometheusClient
-from .scaling import AutoScaler
+from .utils import YamlDumper, get_local_ip, setup_logging
+
+# Discovery, Docker, generator, monitoring and certs modules are imported inside
+# the commands that use them, so e.g. `tsm version` doesn't load the Docker SDK.
 
 console = Console()
 
@@ -32,14 +37,87 @@ load_dotenv(Path.cwd() / ".env")
 TemplateType = Literal["all", "scaling", "certs", "monitoring", "dockerfiles"]
 
 
+# Bump when Service/ServicePort change shape so stale on-disk caches are ignored
+_DISCOVERY_CACHE_VERSION = 1
+
+
+@lru_cache(maxsize=8)
+def _discover(path: str, mtime_ns: int, size: int) -> tuple:
+    """
+    Discover services from a compose file, memoized on (path, mtime, size).
+
+    If TSM_FS_CACHE_DIR is set, results are also pickled there so repeated
+    invocations against an unchanged compose file skip parsing entirely.
+    """
+    from .discovery import ServiceDiscovery
+
+    key = (_DISCOVERY_CACHE_VERSION, path, mtime_ns, size)
+    cache_dir = os.environ.get("TSM_FS_CACHE_DIR")
+    cache_file = None
+    if cache_dir:
+        digest = hashlib.sha1(path.encode()).hexdigest()
+        cache_file = Path(cache_dir) / f"discovery-{digest}.pkl"
+        try:
+            with open(cache_file, "rb") as f:
+                cached = pickle.load(f)
+            if cached["key"] == key:
+                return cached["services"]
+        except Exception:
+            pass
+
+    services = tuple(ServiceDiscovery().discover_services(Path(path)))
+
+    if cache_file is not None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump({"key": key, "services": services}, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_file)
+        except OSError as e:
+            logger.debug("Could not write discovery cache {}: {}", cache_file, e)
+    return services
+
+
+def discover_services_cached(compose_path: Path) -> list:
+    """Return the services in compose_path, reusing results while the file is unchanged."""
+    path = Path(compose_path).resolve()
+    st = path.stat()
+    return list(_discover(str(path), st.st_mtime_ns, st.st_size))
+
+
 def resolve_path(ctx: click.Context, path: str | None) -> Path:
-    """Resolve a path relative to the base directory."""
+    """Resolve a path relative to the base directory.
+
+    Results are memoized in ``ctx.meta`` for the current invocation, so
+    resolving the same path twice does not repeat the realpath syscalls.
+    """
     if not path:
         return Path.cwd()
-    path = Path(path)
-    if path.is_absolute():
-        return path
-    return (ctx.obj.base_dir / path).resolve()
+    cache = ctx.meta.setdefault("tsm.resolved_paths", {})
+    key = (str(ctx.obj.base_dir), str(path))
+    resolved = cache.get(key)
+    if resolved is None:
+        resolved = Path(path)
+        if not resolved.is_absolute():
+            resolved = (ctx.obj.base_dir / resolved).resolve()
+        cache[key] = resolved
+    return resolved
+
+
+# Shared by every command that reads the compose file
+compose_file_option = click.option(
+    "--compose-file",
+    "-f",
+    default="docker-compose.yml",
+    envvar="SERVICES_COMPOSE_FILE",
+    show_envvar=True,
+    help="Docker Compose file path",
+)
+
+
+# Subcommands that don't take the context, so loading the config is wasted work
+_NO_CONFIG_COMMANDS = frozenset({"steps", "version", "clean", "sync-config"})
 
 
 @click.group()
@@ -52,31 +130,30 @@ def cli(
     ctx: click.Context, config: str | None, verbose: bool, quiet: bool, base_dir: str | None
 ) -> None:
     """Traefik Service Manager (TSM) - Manage Traefik and service configurations."""
-    # Configure logging
-    log_level = logging.DEBUG if verbose else (logging.WARNING if quiet else logging.INFO)
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s | %(levelname)-8s | %(name)s:%(funcName)s:%(lineno)d - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    # Configure logging: a single loguru sink, with stdlib logging routed into it
+    setup_logging("DEBUG" if verbose else ("WARNING" if quiet else "INFO"), log_files=False)
     logger.info("TSM started")
 
+    # Informational and Docker-only commands never read ctx.obj
+    if ctx.invoked_subcommand in _NO_CONFIG_COMMANDS:
+        return
+
     # Load configuration
     config_path = Path(config) if config else None
-    logger.debug(f"Config path: {config_path}")
+    logger.debug("Config path: {}", config_path)
     if config_path and config_path.suffix in {".yml", ".yaml"} and "compose" in config_path.name:
-        logger.debug(f"Creating config with compose file: {config_path}")
+        logger.debug("Creating config with compose file: {}", config_path)
         ctx.obj = Config(
             compose_file=str(config_path.absolute()), base_dir=config_path.parent.absolute()
         )
-        logger.debug(f"Base dir set to: {ctx.obj.base_dir}")
+        logger.debug("Base dir set to: {}", ctx.obj.base_dir)
     else:
         ctx.obj = load_config(config_path)
 
     # Set base directory if provided
     if base_dir:
         ctx.obj.base_dir = Path(base_dir)
-        logger.debug(f"Base dir overridden to: {ctx.obj.base_dir}")
+        logger.debug("Base dir overridden to: {}", ctx.obj.base_dir)
 
 
 @cli.command()
@@ -95,12 +172,7 @@ def steps():
 
 
 @cli.command()
-@click.option(
-    "-f",
-    "--compose-file",
-    default="docker-compose.yml",
-    help="Docker Compose file path",
-)
+@compose_file_option
 @click.option(
     "-o",
     "--output-dir",
@@ -127,6 +199,7 @@ def generate(
     external_host: str | None,
 ) -> None:
     """Generate Traefik configuration from Docker Compose file."""
+    from .generator import ConfigGenerator
 
     compose_path = resolve_path(ctx, compose_file)
     output_path = resolve_path(ctx, output_dir)
@@ -139,7 +212,6 @@ def generate(
     output_path.mkdir(parents=True, exist_ok=True)
 
     # Initialize components
-    discovery = ServiceDiscovery()
     generator = ConfigGenerator(
         domain_suffix=domain_suffix,
         external_host=external_host,
@@ -151,11 +223,11 @@ def generate(
         """Generate configuration files."""
         try:
             console.print(f"[blue]Discovering services from {compose_path}...[/blue]")
-            services = discovery.discover_services(compose_path)
+            services = discover_services_cached(compose_path)
 
             console.print(f"[green]Found {len(services)} services[/green]")
-            for service in services:
-                console.print(f"  • {service.name} ({service.image})")
+            if services:
+                console.print("\n".join(f"  • {s.name} ({s.image})" for s in services))
 
             console.print("[blue]Generating Traefik configuration...[/blue]")
             traefik_config = generator.generate_traefik_config(services)
@@ -176,7 +248,7 @@ def generate(
 
 
 @cli.command()
-@click.option("--compose-file", "-f", default="docker-compose.yml", help="Docer Compose file path")
+@compose_file_option
 @click.pass_context
 def discover(ctx: click.Context, compose_file: str) -> None:
     """Discover services from Docker Compose file."""
@@ -186,8 +258,7 @@ def discover(ctx: click.Context, compose_file: str) -> None:
         console.print(f"[red]Error: Compose file not found: {compose_path}[/red]")
         sys.exit(1)
 
-    discovery = ServiceDiscovery()
-    services = discovery.discover_services(compose_path)
+    services = discover_services_cached(compose_path)
 
     # Create a nice table
     table = Table(title="Discovered Services")
@@ -231,6 +302,9 @@ def monitor(
     dry_run: bool,
 ) -> None:
     """Start auto-scaling monitor."""
+    from .docker_client import DockerManager
+    from .monitoring import PrometheusClient
+    from .scaling import AutoScaler
 
     config: Config = ctx.obj
     compose_path = resolve_path(ctx, config.compose_file)
@@ -272,6 +346,74 @@ def monitor(
         autoscaler.stop()
 
 
+def _not_running(name: str) -> dict:
+    """Status placeholder for a compose service with no containers."""
+    return {
+        "name": name,
+        "running_containers": 0,
+        "total_containers": 0,
+        "health_status": "not running",
+        "scaling_enabled": False,
+        "priority": None,
+    }
+
+
+def _dump_json(data: dict) -> None:
+    json.dump(data, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+
+
+def _dump_yaml(data: dict) -> None:
+    yaml.dump(data, sys.stdout, default_flow_style=False, Dumper=YamlDumper)
+
+
+# Machine-readable status formats; anything else renders as a table
+_STATUS_DUMPERS = {"json": _dump_json, "yaml": _dump_yaml}
+
+
+def _print_service_table(service: str, info) -> None:
+    """Render the detailed status table for a single service."""
+    table = Table(title=f"Service Status: {service}")
+    table.add_column("Property", style="cyan")
+    table.add_column("Value", style="green")
+
+    table.add_row("Name", info.name)
+    table.add_row("Running Containers", str(info.running_containers))
+    table.add_row("Total Containers", str(info.total_containers))
+    table.add_row("Health", info.health_status)
+    table.add_row("Scaling Enabled", "✓" if info.scaling_enabled else "✗")
+
+    if info.priority:
+        table.add_row("Priority", info.priority)
+
+    console.print(table)
+
+
+def _print_services_table(names: list[str], statuses: dict) -> None:
+    """Render one status row per compose service."""
+    table = Table(title="Service Status")
+    table.add_column("Service", style="cyan")
+    table.add_column("Running", style="green")
+    table.add_column("Health", style="yellow")
+    table.add_column("Scaling", style="blue")
+    table.add_column("Priority", style="magenta")
+
+    for name in names:
+        info = statuses.get(name)
+        if info is None:
+            table.add_row(name, "0/0", "not running", "✗", "-")
+            continue
+        table.add_row(
+            info.name,
+            f"{info.running_containers}/{info.total_containers}",
+            info.health_status,
+            "✓" if info.scaling_enabled else "✗",
+            info.priority or "-",
+        )
+
+    console.print(table)
+
+
 @cli.command()
 @click.option("--service", "-s", help="Show status for specific service")
 @click.option("--detailed", "-d", is_flag=True, help="Show detailed information")
@@ -285,6 +427,8 @@ def monitor(
 @click.pass_context
 def status(ctx: click.Context, service: str | None, detailed: bool, format: str) -> None:
     """Show service status."""
+    from .discovery import ServiceDiscovery
+    from .docker_client import DockerManager
 
     docker_manager = DockerManager()
     config: Config = ctx.obj
@@ -294,9 +438,9 @@ def status(ctx: click.Context, service: str | None, detailed: bool, format: str)
         console.print(f"[red]Error: Compose file not found: {compose_path}[/red]")
         sys.exit(1)
 
-    # Get services from compose file
-    discovery = ServiceDiscovery()
-    compose_services = {s.name for s in discovery.discover_services(compose_path)}
+    # Only the names are needed here, so skip building Service objects
+    compose_services = ServiceDiscovery().discover_names(compose_path)
+    render = _STATUS_DUMPERS.get(format)
 
     try:
         if service:
@@ -310,77 +454,24 @@ def status(ctx: click.Context, service: str | None, detailed: bool, format: str)
                 console.print(f"[red]Service '{service}' is not running[/red]")
                 sys.exit(1)
 
-            if format == "json":
-                import json
-
-                print(json.dumps(service_info.__dict__, indent=2, default=str))
-            elif format == "yaml":
-                import yaml
-
-                print(yaml.dump(service_info.__dict__, default_flow_style=False))
+            if render:
+                render(service_info.__dict__)
             else:
-                # Table format
-                table = Table(title=f"Service Status: {service}")
-                table.add_column("Property", style="cyan")
-                table.add_column("Value", style="green")
-
-                table.add_row("Name", service_info.name)
-                table.add_row("Running Containers", str(service_info.running_containers))
-                table.add_row("Total Containers", str(service_info.total_containers))
-                table.add_row("Health", service_info.health_status)
-                table.add_row("Scaling Enabled", "✓" if service_info.scaling_enabled else "✗")
-
-                if service_info.priority:
-                    table.add_row("Priority", service_info.priority)
-
-                console.print(table)
+                _print_service_table(service, service_info)
         else:
-            # Show all services from compose file
-            services_info = {}
-            for service_name in compose_services:
-                service_info = docker_manager.get_service_status(service_name)
-                if service_info:
-                    services_info[service_name] = service_info.__dict__
-                else:
-                    services_info[service_name] = {
-                        "name": service_name,
-                        "running_containers": 0,
-                        "total_containers": 0,
-                        "health_status": "not running",
-                        "scaling_enabled": False,
-                        "priority": None,
+            # Show all services from compose file, fetched in one Docker call
+            statuses = docker_manager.get_all_service_statuses(compose_services)
+            names = sorted(compose_services)
+
+            if render:
+                render(
+                    {
+                        name: statuses[name].__dict__ if name in statuses else _not_running(name)
+                        for name in names
                     }
-
-            if format == "json":
-                import json
-
-                print(json.dumps(services_info, indent=2, default=str))
-            elif format == "yaml":
-                import yaml
-
-                print(yaml.dump(services_info, default_flow_style=False))
+                )
             else:
-                # Table format
-                table = Table(title="Service Status")
-                table.add_column("Service", style="cyan")
-                table.add_column("Running", style="green")
-                table.add_column("Health", style="yellow")
-                table.add_column("Scaling", style="blue")
-                table.add_column("Priority", style="magenta")
-
-                for _service_name, info in services_info.items():
-                    scaling = "✓" if info.get("scaling_enabled") else "✗"
-                    priority = info.get("priority") or "-"
-
-                    table.add_row(
-                        info["name"],
-                        f"{info['running_containers']}/{info['total_containers']}",
-                        info["health_status"],
-                        scaling,
-                        priority,
-                    )
-
-                console.print(table)
+                _print_services_table(names, statuses)
 
     except Exception as e:
         logger.error(f"Status check failed: {e}")
@@ -394,14 +485,22 @@ def config(ctx: click.Context) -> None:
     pass
 
 @config.command("init")
-@click.option("--name", "-n", default=os.environ.get("NAME", "proxy"), help="Name of the project")
 @click.option(
-    "--environment", "-e", default=os.environ.get("ENVIRONMENT", "development"), help="Environment"
+    "--name", "-n", default="proxy", envvar="NAME", show_envvar=True, help="Name of the project"
+)
+@click.option(
+    "--environment",
+    "-e",
+    default="development",
+    envvar="ENVIRONMENT",
+    show_envvar=True,
+    help="Environment",
 )
 @click.option(
     "--default-backend-host",
     "-b",
-    default=os.environ.get("DEFAULT_BACKEND_HOST"),
+    envvar="DEFAULT_BACKEND_HOST",
+    show_envvar=True,
     help="Default backend host for HTTP services",
 )
 @click.option(
@@ -422,11 +521,13 @@ def init(
     overwrite: bool,
 ) -> None:
     """Initialize default configuration files."""
+    from .generator import ConfigGenerator
+
     config = ctx.obj
-    logger.debug(f"Config compose file: {config.compose_file}")
-    logger.debug(f"Config base dir: {config.base_dir}")
+    logger.debug("Config compose file: {}", config.compose_file)
+    logger.debug("Config base dir: {}", config.base_dir)
     compose_path = Path(config.compose_file)
-    logger.debug(f"Compose path: {compose_path}")
+    logger.debug("Compose path: {}", compose_path)
     if not compose_path.exists():
         console.print(f"[red]Error: Compose file not found: {compose_path}[/red]")
         sys.exit(1)
@@ -442,8 +543,7 @@ def init(
 
         if created_files:
             console.print("[green]✓ Default configuration files created:[/green]")
-            for file_path in created_files:
-                console.print(f"  • {file_path}")
+            console.print("\n".join(f"  • {file_path}" for file_path in created_files))
 
             console.print("\n[blue]Next steps:[/blue]")
             if template in ["all", "certs"]:
@@ -469,6 +569,7 @@ def init(
 @cli.command()
 def sync_config() -> None:
     """Initialize named volumes for Traefik config."""
+    from .docker_client import DockerManager
 
     docker_manager = DockerManager()
     docker_manager.init_volumes()
@@ -480,6 +581,7 @@ def sync_config() -> None:
 @click.option("--networks", is_flag=True, help="Remove networks")
 def clean(all: bool, volumes: bool, networks: bool) -> None:
     """Clean up Docker resources."""
+    from .docker_client import DockerManager
 
     docker_manager = DockerManager()
 
@@ -515,7 +617,7 @@ def version() -> None:
 
     import platform
 
-    import docker
+    from .docker_client import get_docker_client
 
     table = Table(title="TSM Version Information")
     table.add_column("Component", style="cyan")
@@ -526,8 +628,7 @@ def version() -> None:
     table.add_row("Platform", platform.system())
 
     try:
-        docker_client = docker.from_env()
-        docker_version = docker_client.version()["Version"]
+        docker_version = get_docker_client().version()["Version"]
         table.add_row("Docker", docker_version)
     except Exception:
         table.add_row("Docker", "Not available")
@@ -536,16 +637,13 @@ def version() -> None:
 
 
 @cli.command("generate-hosts")
-@click.option(
-    "--compose-file",
-    "-f",
-    default=os.environ.get("SERVICES_COMPOSE_FILE", "docker-compose.yml"),
-    help="Docker Compose file path (env: SERVICES_COMPOSE_FILE)",
-)
+@compose_file_option
 @click.option(
     "--ip",
     default=None,
-    help="IP address to use for hosts entries (env: HOSTS_IP). If not provided, will auto-detect local IP.",
+    envvar="HOSTS_IP",
+    show_envvar=True,
+    help="IP address to use for hosts entries. If not provided, will auto-detect local IP.",
 )
 @click.option(
     "--output", "-o", default=None, help="Output file for hosts block (default: print to stdout)"
@@ -555,56 +653,112 @@ def generate_hosts(
     ctx: click.Context, compose_file: str, ip: str | None, output: str | None
 ) -> None:
     """Generate a /etc/hosts line for all service domains."""
-    import socket
-
-    from .discovery import ServiceDiscovery
-
     compose_path = Path(compose_file)
     if not compose_path.exists():
         console.print(f"[red]Error: Compose file not found: {compose_path}[/red]")
         sys.exit(1)
     # Auto-detect IP if not provided
     if not ip:
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            ip = s.getsockname()[0]
-            s.close()
-        except Exception:
-            ip = "127.0.0.1"
-    discovery = ServiceDiscovery()
-    services = discovery.discover_services(compose_path)
+        ip = get_local_ip() or "127.0.0.1"
+    services = discover_services_cached(compose_path)
     all_domains = set()
     for service in services:
         all_domains.update(service.domain_names)
     if not all_domains:
         console.print("[yellow]No domains found in services.[/yellow]")
         sys.exit(0)
-    hosts_line = f"{ip} " + " ".join(sorted(all_domains))
+    hosts_line = " ".join([ip, *sorted(all_domains)])
     if output:
-        with open(output, "w") as f:
-            f.write(hosts_line + "\n")
+        Path(output).write_text(hosts_line + "\n")
         console.print(f"[green]✓ Hosts line written to {output}[/green]")
     else:
         console.print("[blue]Add the following line to your /etc/hosts:[/blue]")
         console.print(hosts_line)
 
 
+def _run_streaming(command: list[str]) -> int:
+    """Run command, echoing its combined output line by line as it arrives."""
+    logger.debug("Running command: {}", command)
+    with subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+    ) as proc:
+        for line in proc.stdout:
+            console.out(line, end="", highlight=False)
+    return proc.returncode
+
+
+def _bake_images(
+    images: dict[str, Path], tag_prefix: str, context_path: Path, no_cache: bool
+) -> dict[str, bool] | None:
+    """
+    Build all images in one `docker buildx bake` run so BuildKit builds them in
+    parallel and shares base layers.
+
+    Returns {name: built} per image, or None if bake is unavailable. If bake
+    fails, every image is reported as failed.
+    """
+    try:
+        probe = subprocess.run(
+            ["docker", "buildx", "bake", "--help"], capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        return None
+    if probe.returncode != 0:
+        return None
+
+    # Bake target names are restricted to [a-zA-Z0-9_-]
+    targets = {re.sub(r"[^a-zA-Z0-9_-]", "_", name): name for name in images}
+    bake = {
+        "group": {"default": {"targets": list(targets)}},
+        "target": {
+            target: {
+                "context": str(context_path),
+                "dockerfile": str(images[name].resolve()),
+                "tags": [f"{tag_prefix}{name}"],
+                "no-cache": no_cache,
+            }
+            for target, name in targets.items()
+        },
+    }
+    with tempfile.TemporaryDirectory(prefix="tsm-bake-") as tmp:
+        bake_file = Path(tmp) / "docker-bake.json"
+        metadata_file = Path(tmp) / "metadata.json"
+        bake_file.write_text(json.dumps(bake))
+        console.print(
+            f"[blue]Building {len(images)} images with context {context_path} (buildx bake)...[/blue]"
+        )
+        command = ["docker", "buildx", "bake", "-f", str(bake_file)]
+        command.extend(["--metadata-file", str(metadata_file)])
+        if _run_streaming(command) != 0:
+            return dict.fromkeys(images, False)
+        try:
+            metadata = json.loads(metadata_file.read_text())
+        except (OSError, ValueError):
+            metadata = {}
+    # After a successful run, only targets with metadata are known to be built
+    return {name: target in metadata for target, name in targets.items()}
+
+
 @cli.command("build-dockerfiles")
 @click.option(
     "--dockerfiles-dir",
     "-d",
-    default=os.environ.get("DOCKERFILES_DIR", "dockerfiles"),
+    default="dockerfiles",
+    envvar="DOCKERFILES_DIR",
+    show_envvar=True,
     help="Directory containing dockerfile subdirectories (default: ./dockerfiles)",
 )
 @click.option(
     "--tag-prefix",
-    default=os.environ.get("TAG_PREFIX", "fp/"),
+    default="fp/",
+    envvar="TAG_PREFIX",
+    show_envvar=True,
     help="Prefix for built image tags (default: fp/)",
 )
 @click.option(
     "--context-dir",
-    default=os.environ.get("CONTEXT_DIR"),
+    envvar="CONTEXT_DIR",
+    show_envvar=True,
     help="Docker build context directory (default: .)",
 )
 @click.option(
@@ -637,34 +791,41 @@ def build_dockerfiles(
         console.print(f"[red]Context directory not found: {context_path}[/red]")
         sys.exit(1)
 
+    # DirEntry.is_dir() uses the type readdir already returned, so only the
+    # Dockerfile check costs a stat per subdirectory
+    with os.scandir(dockerfiles_path) as entries:
+        subdirs = sorted((e.name, e.path) for e in entries if e.is_dir())
+    images = {
+        name: dockerfile
+        for name, path in subdirs
+        if (dockerfile := Path(path, "Dockerfile")).is_file()
+    }
     built_any = False
-    for subdir in dockerfiles_path.iterdir():
-        if subdir.is_dir():
-            dockerfile = subdir / "Dockerfile"
-            if dockerfile.exists():
-                image_tag = f"{tag_prefix}{subdir.name}"
-                console.print(
-                    f"[blue]Building {dockerfile} as {image_tag} with context {context_path}...[/blue]"
-                )
-                import subprocess
-
-                command = ["docker", "buildx", "build", "-f", str(dockerfile)]
-                if no_cache:
-                    command.append("--no-cache")
-                command.extend(["-t", image_tag, str(context_path)])
-
-                logger.debug(f"[blue]Running command: {command}[/blue]")
-                result = subprocess.run(
-                    command,
-                    capture_output=True,
-                    text=True,
-                )
-                if result.returncode == 0:
-                    console.print(f"[green]✓ Built {image_tag}[/green]")
-                    built_any = True
-                else:
-                    console.print(f"[red]Failed to build {image_tag}[/red]")
-                    console.print(result.stderr)
+    results = _bake_images(images, tag_prefix, context_path, no_cache) if images else None
+    if results is not None:
+        for name, ok in results.items():
+            if ok:
+                console.print(f"[green]✓ Built {tag_prefix}{name}[/green]")
+                built_any = True
+            else:
+                console.print(f"[red]Failed to build {tag_prefix}{name}[/red]")
+    else:
+        # buildx bake unavailable: build one image at a time
+        for name, dockerfile in images.items():
+            image_tag = f"{tag_prefix}{name}"
+            console.print(
+                f"[blue]Building {dockerfile} as {image_tag} with context {context_path}...[/blue]"
+            )
+            command = ["docker", "buildx", "build", "-f", str(dockerfile)]
+            if no_cache:
+                command.append("--no-cache")
+            command.extend(["-t", image_tag, str(context_path)])
+
+            if _run_streaming(command) == 0:
+                console.print(f"[green]✓ Built {image_tag}[/green]")
+                built_any = True
+            else:
+                console.print(f"[red]Failed to build {image_tag}[/red]")
     if not built_any:
         console.print("[yellow]No Dockerfiles found to build.[/yellow]")
 
@@ -674,7 +835,9 @@ def build_dockerfiles(
     "--config",
     "-c",
     type=click.Path(exists=True),
-    default=os.environ.get("CERT_CONFIG_FILE", "cert-config.yml"),
+    default="cert-config.yml",
+    envvar="CERT_CONFIG_FILE",
+    show_envvar=True,
     help="Path to certificate configuration YAML file",
 )
 @click.option(
@@ -687,28 +850,38 @@ def build_dockerfiles(
 @click.option("--name", default=None, help="Name for the certificate files (default: type name)")
 @click.option(
     "--common-name",
-    default=os.environ.get("COMMON_NAME", "traefik"),
+    default="traefik",
+    envvar="COMMON_NAME",
+    show_envvar=True,
     help="Common Name (CN) for the certificate (default: traefik)",
 )
 @click.option(
     "--hosts",
-    default=os.environ.get("HOSTS", "localhost,127.0.0.1,traefik"),
+    default="localhost,127.0.0.1,traefik",
+    envvar="HOSTS",
+    show_envvar=True,
     help="Comma-separated list of hosts for the cert",
 )
 @click.option(
     "--output-dir",
-    default=os.environ.get("OUTPUT_DIR", "./certs"),
+    default="./certs",
+    envvar="OUTPUT_DIR",
+    show_envvar=True,
     help="Base directory to write certs to (default: ./certs)",
 )
 @click.option(
     "--cert-config-dir",
-    default=os.environ.get("CERT_CONFIG_DIR", "cert-config"),
+    default="cert-config",
+    envvar="CERT_CONFIG_DIR",
+    show_envvar=True,
     help="Directory containing ca-csr.json, ca-config.json, csr-template.json",
 )
 @click.option("--profile", default="server", help="cfssl profile to use (default: server)")
 @click.option(
     "--domain",
-    default=os.environ.get("DOMAIN", "example.com"),
+    default="example.com",
+    envvar="DOMAIN",
+    show_envvar=True,
     help="Domain for wildcard certs (default: example.com)",
 )
 @click.option(
@@ -766,6 +939,8 @@ def generate_certs(
 @click.pass_context
 def copy_certs(ctx: click.Context, from_dir: str, to_dir: str) -> None:
     """Copy certificates from one directory to another if they exist."""
+    from .certs import copy_certs as copy_certs_func
+
     from_path = resolve_path(ctx, from_dir)
     to_path = resolve_path(ctx, to_dir)
     copy_certs_func(from_path, to_path, console)
@@ -777,7 +952,9 @@ def copy_certs(ctx: click.Context, from_dir: str, to_dir: str) -> None:
 @click.option(
     "--output",
     "-o",
-    default=os.environ.get("OUTPUT_DIR", "./config/usersfile"),
+    default="./config/usersfile",
+    envvar="OUTPUT_DIR",
+    show_envvar=True,
     help="Output path for usersfile (e.g., ./config/usersfile)",
 )
 @click.pass_context
@@ -793,6 +970,111 @@ def generate_usersfile_cmd(ctx: click.Context, username: str, password: str, out
         console.print(f"[red]Failed to generate usersfile: {e}[/red]")
 
 
+@cli.command("init-deploy")
+@click.option(
+    "--cert-config",
+    type=click.Path(exists=True),
+    default="cert-config.yml",
+    envvar="CERT_CONFIG_FILE",
+    show_envvar=True,
+    help="Path to certificate configuration YAML file",
+)
+@click.option(
+    "--cert-output-dir",
+    default="./certs",
+    envvar="OUTPUT_DIR",
+    show_envvar=True,
+    help="Base directory to write certs to (default: ./certs)",
+)
+@click.option(
+    "--cert-config-dir",
+    default="cert-config",
+    envvar="CERT_CONFIG_DIR",
+    show_envvar=True,
+    help="Directory containing ca-csr.json, ca-config.json, csr-template.json",
+)
+@click.option("--username", "-u", required=True, help="Username for basic auth")
+@click.option("--password", "-p", required=True, help="Password for basic auth")
+@click.option(
+    "--usersfile",
+    default="./config/usersfile",
+    help="Output path for usersfile (default: ./config/usersfile)",
+)
+@compose_file_option
+@click.option(
+    "-o",
+    "--output-dir",
+    default="config/traefik/dynamic",
+    help="Output directory for generated config",
+)
+@click.option("-d", "--domain-suffix", default=".ddev", help="Domain suffix for services")
+@click.option("-h", "--external-host", help="External host for services")
+@click.pass_context
+def init_deploy(
+    ctx: click.Context,
+    cert_config: str,
+    cert_output_dir: str,
+    cert_config_dir: str,
+    username: str,
+    password: str,
+    usersfile: str,
+    compose_file: str,
+    output_dir: str,
+    domain_suffix: str,
+    external_host: str | None,
+) -> None:
+    """Generate certs, usersfile and Traefik config in one run.
+
+    Certs and the usersfile don't depend on each other, so they are produced
+    concurrently; the Traefik config is generated once both have finished.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .certs import generate_certs_from_config
+    from .usersfile import generate_usersfile
+
+    config_path = resolve_path(ctx, cert_config)
+    certs_path = resolve_path(ctx, cert_output_dir)
+    cert_config_path = resolve_path(ctx, cert_config_dir)
+    usersfile_path = resolve_path(ctx, usersfile)
+
+    def certs_job() -> None:
+        with console:
+            generate_certs_from_config(config_path, certs_path, cert_config_path, console)
+
+    def usersfile_job() -> None:
+        generate_usersfile(username, password, usersfile_path)
+        console.print(f"[green]✓ Usersfile written to {usersfile_path}[/green]")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        jobs = {"Certificate generation": pool.submit(certs_job)}
+        jobs["Usersfile generation"] = pool.submit(usersfile_job)
+
+    failed = False
+    for step, job in jobs.items():
+        try:
+            job.result()
+        except SystemExit as e:
+            # The job already printed its own error before exiting
+            logger.error(f"{step} failed with exit code {e.code}")
+            console.print(f"[red]{step} failed[/red]")
+            failed = True
+        except Exception as e:
+            logger.error(f"{step} failed: {e}")
+            console.print(f"[red]{step} failed: {e}[/red]")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+    ctx.invoke(
+        generate,
+        compose_file=compose_file,
+        output_dir=output_dir,
+        domain_suffix=domain_suffix,
+        external_host=external_host,
+    )
+
+
 def main() -> None:
     """Main entry point."""
     try:
@@ -1,16 +1,21 @@
 """Configuration management for TSM."""
 
+from functools import cache, lru_cache
 from pathlib import Path
 from typing import Any
 
 import yaml
 from loguru import logger
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from .utils import YamlLoader
 
 
 class ScalingConfig(BaseModel):
     """Auto-scaling configuration for a service."""
 
+    model_config = ConfigDict(defer_build=True)
+
     enabled: bool = True
     min_replicas: int = Field(ge=1, default=1)
     max_replicas: int = Field(ge=1, default=10)
@@ -33,6 +38,8 @@ class ScalingConfig(BaseModel):
 class GlobalScalingConfig(BaseModel):
     """Global auto-scaling configuration."""
 
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
     check_interval: int = Field(ge=10, default=60)  # seconds
     scale_up_threshold: float = Field(ge=0, le=100, default=80.0)
     scale_down_threshold: float = Field(ge=0, le=100, default=30.0)
@@ -45,6 +52,8 @@ class GlobalScalingConfig(BaseModel):
 class RateLimitConfig(BaseModel):
     """Rate limiting configuration."""
 
+    model_config = ConfigDict(defer_build=True)
+
     burst: int = Field(ge=1, default=100)
     average: int = Field(ge=1, default=50)
     period: str = Field(default="1m", pattern=r"^\d+[smh]$")
@@ -53,6 +62,8 @@ class RateLimitConfig(BaseModel):
 class HealthCheckConfig(BaseModel):
     """Health check configuration."""
 
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
     interval: str = Field(default="30s", pattern=r"^\d+[smh]$")
     timeout: str = Field(default="5s", pattern=r"^\d+[smh]$")
     retries: int = Field(ge=1, default=3)
@@ -62,6 +73,8 @@ class HealthCheckConfig(BaseModel):
 class PrometheusConfig(BaseModel):
     """Prometheus configuration."""
 
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
     url: str = Field(default="http://localhost:9090")
     timeout: int = Field(ge=1, default=30)
     verify_ssl: bool = Field(default=True)
@@ -87,6 +100,8 @@ class PrometheusConfig(BaseModel):
 class TraefikConfig(BaseModel):
     """Traefik configuration."""
 
+    model_config = ConfigDict(defer_build=True)
+
     domain_suffix: str = Field(default=".ddev")
     external_host: str | None = Field(default=None)
 
@@ -103,6 +118,8 @@ class TraefikConfig(BaseModel):
 class DockerConfig(BaseModel):
     """Docker configuration."""
 
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
     socket_path: str = Field(default="unix:///var/run/docker.sock")
     api_version: str = Field(default="auto")
     timeout: int = Field(ge=1, default=60)
@@ -112,22 +129,34 @@ class DockerConfig(BaseModel):
     monitoring_network: str = Field(default="monitoring")
 
 
+@cache
+def _shared_default(model: type[BaseModel]) -> BaseModel:
+    """Return one default instance per frozen sub-config, built on first use."""
+    return model()
+
+
 class Config(BaseModel):
     """Main TSM configuration."""
 
+    model_config = ConfigDict(defer_build=True)
+
     # Global settings
     environment: str = Field(default="development", pattern=r"^(development|staging|production)$")
     log_level: str = Field(default="INFO", pattern=r"^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$")
     base_dir: Path = Field(default_factory=Path.cwd)
 
     # Component configurations
-    global_scaling: GlobalScalingConfig = Field(default_factory=GlobalScalingConfig)
+    global_scaling: GlobalScalingConfig = Field(
+        default_factory=lambda: _shared_default(GlobalScalingConfig)
+    )
     services: dict[str, ScalingConfig] = Field(default_factory=dict)
     rate_limits: dict[str, RateLimitConfig] = Field(default_factory=dict)
-    health_checks: HealthCheckConfig = Field(default_factory=HealthCheckConfig)
-    prometheus: PrometheusConfig = Field(default_factory=PrometheusConfig)
+    health_checks: HealthCheckConfig = Field(
+        default_factory=lambda: _shared_default(HealthCheckConfig)
+    )
+    prometheus: PrometheusConfig = Field(default_factory=lambda: _shared_default(PrometheusConfig))
     traefik: TraefikConfig = Field(default_factory=TraefikConfig)
-    docker: DockerConfig = Field(default_factory=DockerConfig)
+    docker: DockerConfig = Field(default_factory=lambda: _shared_default(DockerConfig))
 
     # File paths
     compose_file: str = Field(default="docker-compose.yml")
@@ -136,14 +165,23 @@ class Config(BaseModel):
 
     def get_service_scaling_config(self, service_name: str) -> ScalingConfig:
         """Get scaling configuration for a service, using defaults if not specified."""
-        if service_name in self.services:
-            return self.services[service_name]
+        scaling = self.services.get(service_name)
+        return scaling if scaling is not None else ScalingConfig()
+
+
+@lru_cache(maxsize=8)
+def _read_config_data(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a config file; keyed on mtime/size so edits invalidate the entry.
+
+    The returned dict is shared between callers and must not be mutated;
+    ``Config(**data)`` copies it into fresh model instances.
+    """
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=YamlLoader) or {}
 
 
 def load_config(path=None):
     """Load configuration from YAML file or return default Config."""
-    from pathlib import Path
-
     if path is None:
         logger.info("No config path provided, using default Config.")
         return Config()
@@ -156,8 +194,8 @@ def load_config(path=None):
             config.base_dir = path.parent.absolute()
             return config
 
-        with open(path) as f:
-            data = yaml.safe_load(f)
+        st = path.stat()
+        data = _read_config_data(str(path.absolute()), st.st_mtime_ns, st.st_size)
         return Config(**data)
     except Exception as e:
         logger.error(f"Failed to load config from {path}: {e}")
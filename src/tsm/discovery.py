@@ -1,17 +1,106 @@
 """Service discovery from Docker Compose files."""
 
+import os
+import re
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from pathlib import Path
 
 import yaml
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from .config import ScalingConfig
+from .utils import YamlLoader
+
+# Host(`example.com`) / HostRegexp(`{sub:[a-z]+}.example.com`) in Traefik rules
+_HOST_RULE_RE = re.compile(r"Host(?:Regexp)?\([`'\"]([^`'\"]+)[`'\"]\)")
+
+ROUTER_PREFIX = "traefik.http.routers."
+_SERVICE_PREFIX = "traefik.http.services."
+_PORT_SUFFIX = ".loadbalancer.server.port"
+_ADDRESS_SUFFIX = ".loadbalancer.server.address"
+_SCHEME_MARKER = ".loadbalancer.server.scheme"
+_TCP_PREFIX = "traefik.tcp."
+
+_SCALING_PREFIX = "tsm.scaling."
+_SCALING_PREFIX_LEN = len(_SCALING_PREFIX)
+_SCALING_INT_PARAMS = frozenset(
+    {"min_replicas", "max_replicas", "scale_up_cooldown", "scale_down_cooldown"}
+)
+_SCALING_FLOAT_PARAMS = frozenset(
+    {"target_cpu", "target_memory", "scale_up_threshold", "scale_down_threshold"}
+)
+
+
+@lru_cache(maxsize=8)
+def _load_compose(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a compose file, memoized on (path, mtime, size).
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=YamlLoader) or {}
+
+
+def _parse_key_values(items: list[str]) -> dict[str, str]:
+    """Turn ["KEY=value", ...] into a dict, skipping entries without '='."""
+    return {key: value for key, sep, value in (item.partition("=") for item in items) if sep}
+
+
+def read_compose(compose_file: Path) -> dict:
+    """Return the parsed compose file, reparsing only when it changes on disk.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    path = os.path.abspath(compose_file)
+    st = os.stat(path)
+    return _load_compose(path, st.st_mtime_ns, st.st_size)
+
+
+@dataclass
+class TraefikLabels:
+    """A service's Traefik labels bucketed for config generation, in label order."""
+
+    is_tcp: bool = False
+    # label -> value for traefik.http.services.*.loadbalancer.server.address
+    http_addresses: dict[str, str] = field(default_factory=dict)
+    # (label, value) for traefik.http.services.*.loadbalancer.server.port*
+    http_ports: list[tuple[str, str]] = field(default_factory=list)
+    # (name, subkey or None, value) for traefik.tcp.routers.* / traefik.tcp.services.*
+    tcp_routers: list[tuple[str, str | None, str]] = field(default_factory=list)
+    tcp_services: list[tuple[str, str | None, str]] = field(default_factory=list)
+
+
+def _index_traefik_labels(labels: dict[str, str]) -> TraefikLabels:
+    """Bucket Traefik labels in a single pass over the label dict."""
+    index = TraefikLabels()
+    for key, value in labels.items():
+        if key.startswith(_TCP_PREFIX):
+            index.is_tcp = True
+            # traefik.tcp.<routers|services>.<name>[.<subkey>]
+            parts = key.split(".", 4)
+            if len(parts) >= 4:
+                entry = (parts[3], parts[4] if len(parts) > 4 else None, value)
+                if parts[2] == "routers":
+                    index.tcp_routers.append(entry)
+                elif parts[2] == "services":
+                    index.tcp_services.append(entry)
+        elif key.startswith(_SERVICE_PREFIX):
+            if key.endswith(_ADDRESS_SUFFIX):
+                index.http_addresses[key] = value
+            if _PORT_SUFFIX in key:
+                index.http_ports.append((key, value))
+            if _SCHEME_MARKER in key and value.strip().lower() == "tcp":
+                index.is_tcp = True
+    return index
 
 
 class ServicePort(BaseModel):
     """Container port configuration."""
 
+    model_config = ConfigDict(defer_build=True)
+
     internal: int
     external: int | None = None
     protocol: str = "tcp"
@@ -20,6 +109,9 @@ class ServicePort(BaseModel):
 class Service(BaseModel):
     """Discovered service information."""
 
+    # Frozen so the cached_property values below cannot go stale
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
     name: str
     image: str
     ports: list[ServicePort]
@@ -44,37 +136,33 @@ class Service(BaseModel):
         """Get the main service port: prefer Traefik label port if present, else first port."""
         if self.traefik_service_port:
             logger.debug(
-                f"Service {self.name}: Using traefik_service_port={self.traefik_service_port} from label."
+                "Service {}: Using traefik_service_port={} from label.",
+                self.name,
+                self.traefik_service_port,
             )
             return self.traefik_service_port
         if self.ports:
             logger.debug(
-                f"Service {self.name}: Using first port from ports list: {self.ports[0].internal}"
+                "Service {}: Using first port from ports list: {}",
+                self.name,
+                self.ports[0].internal,
             )
             return self.ports[0].internal
-        logger.debug(f"Service {self.name}: No port found.")
+        logger.debug("Service {}: No port found.", self.name)
         return None
 
-    @property
+    @cached_property
     def domain_names(self) -> list[str]:
-        """Extract domain names from Traefik rule."""
+        """Extract domain names from Traefik rule (computed once per service)."""
         if not self.traefik_rule:
             return []
 
-        domains = []
-        import re
-
-        # Extract Host rules like Host(`example.com`) or Host(`app.domain.com`)
-        host_pattern = r"Host\([`'\"]([^`'\"]+)[`'\"]\)"
-        matches = re.findall(host_pattern, self.traefik_rule)
-        domains.extend(matches)
+        return _HOST_RULE_RE.findall(self.traefik_rule)
 
-        # Extract HostRegexp rules
-        regexp_pattern = r"HostRegexp\([`'\"]([^`'\"]+)[`'\"]\)"
-        matches = re.findall(regexp_pattern, self.traefik_rule)
-        domains.extend(matches)
-
-        return domains
+    @cached_property
+    def traefik_labels(self) -> TraefikLabels:
+        """Traefik labels bucketed by kind (computed once per service)."""
+        return _index_traefik_labels(self.labels)
 
 
 class ServiceDiscovery:
@@ -83,14 +171,20 @@ class ServiceDiscovery:
     def __init__(self) -> None:
         self.logger = logger.bind(component="discovery")
 
+        # With TSM_TRUST_INPUT set, services and ports are built with
+        # model_construct: the parser has already coerced their values, so
+        # pydantic validation is skipped. Scaling labels are always validated.
+        trust_input = os.environ.get("TSM_TRUST_INPUT", "").lower() in {"1", "true", "yes"}
+        self._service = Service.model_construct if trust_input else Service
+        self._port = ServicePort.model_construct if trust_input else ServicePort
+
     def discover_services(self, compose_file: Path) -> list[Service]:
         """Discover services from a Docker Compose file."""
 
         self.logger.info(f"Discovering services from {compose_file}")
 
         try:
-            with open(compose_file) as f:
-                compose_data = yaml.safe_load(f)
+            compose_data = read_compose(compose_file)
         except Exception as e:
             raise RuntimeError(f"Failed to parse compose file: {e}") from e
 
@@ -103,7 +197,7 @@ class ServiceDiscovery:
             try:
                 service = self._parse_service(service_name, service_config)
                 services.append(service)
-                self.logger.debug(f"Discovered service: {service_name}")
+                self.logger.debug("Discovered service: {}", service_name)
             except Exception as e:
                 self.logger.error(f"Failed to parse service {service_name}: {e}")
                 continue
@@ -111,6 +205,18 @@ class ServiceDiscovery:
         self.logger.info(f"Discovered {len(services)} services")
         return services
 
+    def discover_names(self, compose_file: Path) -> set[str]:
+        """Return just the service names in a Docker Compose file.
+
+        Skips building Service objects, for callers that only need names.
+        """
+        try:
+            compose_data = read_compose(compose_file)
+        except Exception as e:
+            raise RuntimeError(f"Failed to parse compose file: {e}") from e
+
+        return set(compose_data.get("services") or ())
+
     def _parse_service(self, name: str, config: dict) -> Service:
         """Parse a single service configuration."""
 
@@ -124,12 +230,10 @@ class ServiceDiscovery:
         labels = config.get("deploy", {}).get("labels", [])
         if isinstance(labels, list):
             # Convert list format to dict
-            label_dict = {}
-            for label in labels:
-                if "=" in label:
-                    key, value = label.split("=", 1)
-                    label_dict[key] = value
-            labels = label_dict
+            labels = _parse_key_values(labels)
+        else:
+            # Don't hand the cached compose data to the model
+            labels = dict(labels)
 
         # Parse environment variables
         environment = self._parse_environment(config.get("environment", {}))
@@ -139,9 +243,9 @@ class ServiceDiscovery:
 
         # Parse depends_on
         depends_on = config.get("depends_on", [])
-        if isinstance(depends_on, dict):
-            depends_on = list(depends_on.keys())
-        elif not isinstance(depends_on, list):
+        if isinstance(depends_on, (dict, list)):
+            depends_on = list(depends_on)
+        else:
             depends_on = []
 
         # Parse Traefik configuration from labels
@@ -150,7 +254,7 @@ class ServiceDiscovery:
         # Parse auto-scaling configuration from labels
         scaling_config = self._parse_scaling_labels(labels)
 
-        return Service(
+        return self._service(
             name=name,
             image=config.get("image", ""),
             ports=ports,
@@ -167,37 +271,37 @@ class ServiceDiscovery:
     def _parse_ports(self, ports_config: list) -> list[ServicePort]:
         """Parse port configuration."""
         ports = []
+        make_port = self._port
 
         for port in ports_config:
             if isinstance(port, int):
                 # Simple port mapping
-                ports.append(ServicePort(internal=port))
+                ports.append(make_port(internal=port))
             elif isinstance(port, str):
-                # String format like "8080:80" or "8080:80/tcp"
-                if ":" in port:
-                    external_str, internal_str = port.split(":", 1)
+                # String format like "8080:80", "8080:80/tcp" or "80"; malformed
+                # entries are skipped
+                external_str, sep, internal_str = port.partition(":")
+                if not sep:
+                    if port.isdecimal():
+                        ports.append(make_port(internal=int(port)))
+                    continue
 
-                    # Handle protocol
+                # Handle protocol
+                internal_str, sep, protocol = internal_str.partition("/")
+                if not sep:
                     protocol = "tcp"
-                    if "/" in internal_str:
-                        internal_str, protocol = internal_str.split("/", 1)
-
-                    try:
-                        external = int(external_str) if external_str else None
-                        internal = int(internal_str)
-                        ports.append(
-                            ServicePort(internal=internal, external=external, protocol=protocol)
+
+                if internal_str.isdecimal() and (not external_str or external_str.isdecimal()):
+                    ports.append(
+                        make_port(
+                            internal=int(internal_str),
+                            external=int(external_str) if external_str else None,
+                            protocol=protocol,
                         )
-                    except ValueError:
-                        continue
-                else:
-                    # Just internal port
-                    try:
-                        ports.append(ServicePort(internal=int(port)))
-                    except ValueError:
-                        continue
+                    )
             elif isinstance(port, dict):
-                # Dict format with target, published, protocol
+                # Dict format with target, published, protocol; values are
+                # not coerced here, so this always goes through validation
                 internal = port.get("target")
                 external = port.get("published")
                 protocol = port.get("protocol", "tcp")
@@ -212,7 +316,7 @@ class ServiceDiscovery:
     def _parse_networks(self, networks_config) -> list[str]:
         """Parse network configuration."""
         if isinstance(networks_config, list):
-            return networks_config
+            return list(networks_config)
         elif isinstance(networks_config, dict):
             return list(networks_config.keys())
         else:
@@ -222,12 +326,7 @@ class ServiceDiscovery:
         """Parse environment variables."""
         if isinstance(env_config, list):
             # Convert list format to dict
-            env_dict = {}
-            for env in env_config:
-                if "=" in env:
-                    key, value = env.split("=", 1)
-                    env_dict[key] = value
-            return env_dict
+            return _parse_key_values(env_config)
         elif isinstance(env_config, dict):
             # Convert all values to strings
             return {k: str(v) for k, v in env_config.items()}
@@ -265,53 +364,37 @@ class ServiceDiscovery:
         if labels.get("traefik.enable") == "true":
             traefik_config["traefik_enabled"] = True
 
-        # Find router configuration
+        # One pass over the labels: the first router rule, and every service
+        # port label in declaration order
         router_name = None
-        for key in labels:
-            if key.startswith("traefik.http.routers.") and key.endswith(".rule"):
-                router_name = key.split(".")[3]
-                traefik_config["traefik_rule"] = labels[key]
-                break
-
-        # Find all possible service port labels
-        port_labels = [
-            (k, v)
-            for k, v in labels.items()
-            if k.startswith("traefik.http.services.") and k.endswith(".loadbalancer.server.port")
-        ]
-
-        selected_port = None
-        selected_label = None
-        # Prefer port label matching router name
+        port_labels = []
+        for key, value in labels.items():
+            if key.startswith(ROUTER_PREFIX):
+                if router_name is None and key.endswith(".rule"):
+                    router_name = key.split(".")[3]
+                    traefik_config["traefik_rule"] = value
+            elif key.startswith(_SERVICE_PREFIX) and key.endswith(_PORT_SUFFIX):
+                port_labels.append((key, value))
+
+        # Prefer the port label matching the router name, otherwise the first
+        # valid one
         if router_name:
-            expected_key = f"traefik.http.services.{router_name}.loadbalancer.server.port"
-            for k, v in port_labels:
-                if k == expected_key:
-                    try:
-                        selected_port = int(v)
-                        selected_label = k
-                        break
-                    except ValueError:
-                        continue
-        # Otherwise, use the first available port label
-        if selected_port is None and port_labels:
-            for k, v in port_labels:
-                try:
-                    selected_port = int(v)
-                    selected_label = k
-                    break
-                except ValueError:
-                    continue
-        if selected_port is not None:
-            traefik_config["traefik_service_port"] = selected_port
-            logger.debug(f"Service port from label: {selected_label} = {selected_port}")
+            expected_key = f"{_SERVICE_PREFIX}{router_name}{_PORT_SUFFIX}"
+            if expected_key in labels:
+                port_labels.insert(0, (expected_key, labels[expected_key]))
+        for label, value in port_labels:
+            try:
+                traefik_config["traefik_service_port"] = int(value)
+            except ValueError:
+                continue
+            logger.debug("Service port from label: {} = {}", label, value)
+            break
 
         # Get middlewares
         if router_name:
-            middleware_key = f"traefik.http.routers.{router_name}.middlewares"
-            if middleware_key in labels:
-                middlewares = labels[middleware_key].split(",")
-                traefik_config["traefik_middlewares"] = [m.strip() for m in middlewares]
+            middlewares = labels.get(f"{ROUTER_PREFIX}{router_name}.middlewares")
+            if middlewares is not None:
+                traefik_config["traefik_middlewares"] = [m.strip() for m in middlewares.split(",")]
 
         return traefik_config
 
@@ -324,25 +407,15 @@ class ServiceDiscovery:
 
         # Parse scaling parameters
         for key, value in labels.items():
-            if not key.startswith("tsm.scaling."):
+            if not key.startswith(_SCALING_PREFIX):
                 continue
 
-            param = key.replace("tsm.scaling.", "")
+            param = key[_SCALING_PREFIX_LEN:]
 
             try:
-                if param in [
-                    "min_replicas",
-                    "max_replicas",
-                    "scale_up_cooldown",
-                    "scale_down_cooldown",
-                ]:
+                if param in _SCALING_INT_PARAMS:
                     scaling_config[param] = int(value)
-                elif param in [
-                    "target_cpu",
-                    "target_memory",
-                    "scale_up_threshold",
-                    "scale_down_threshold",
-                ]:
+                elif param in _SCALING_FLOAT_PARAMS:
                     scaling_config[param] = float(value)
                 elif param == "enabled":
                     scaling_config[param] = value.lower() == "true"
@@ -373,9 +446,7 @@ class ServiceDiscovery:
 
         for service in services:
             for network in service.networks:
-                if network not in networks:
-                    networks[network] = []
-                networks[network].append(service.name)
+                networks.setdefault(network, []).append(service.name)
 
         return networks
 
@@ -1,18 +1,40 @@
 """Docker client wrapper for service management."""
 
+import json
+import os
+import re
+import shutil
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import docker
+import yaml
 from docker.errors import APIError, DockerException, NotFound
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+from .discovery import ROUTER_PREFIX, read_compose
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # optional: fall back to the stdlib decoder
+    json_loads = json.loads
+
+# The models below are filled from daemon responses whose types are already
+# known, so they are built with model_construct and skip validation.
 
 
 class ContainerInfo(BaseModel):
     """Container information."""
 
+    model_config = ConfigDict(defer_build=True)
+
     id: str
     name: str
     service_name: str | None = None
@@ -28,6 +50,8 @@ class ContainerInfo(BaseModel):
 class ServiceStatus(BaseModel):
     """Service status information."""
 
+    model_config = ConfigDict(defer_build=True)
+
     name: str
     running_containers: int
     total_containers: int
@@ -44,6 +68,8 @@ class ServiceStatus(BaseModel):
 class ContainerMetrics(BaseModel):
     """Container metrics for auto-scaling."""
 
+    model_config = ConfigDict(defer_build=True)
+
     container_id: str
     name: str
     cpu_percent: float
@@ -55,14 +81,169 @@ class ContainerMetrics(BaseModel):
     timestamp: str
 
 
+@lru_cache(maxsize=1)
+def get_docker_client() -> docker.DockerClient:
+    """Return the process-wide Docker client.
+
+    The SDK keeps a keep-alive session to the daemon socket, so sharing one
+    client lets every DockerManager (and `tsm version`) reuse the connection.
+    The pool size does not limit concurrency; it is how many connections are
+    kept for reuse. Each stats stream holds one for as long as it runs, on top
+    of the worker threads' requests, and with docker-py's default of 10 the
+    extra connections would be discarded with a "Connection pool is full"
+    warning.
+    """
+    return docker.from_env(max_pool_size=API_WORKERS + MAX_STATS_STREAMS)
+
+
+COMPOSE_SERVICE_LABEL = "com.docker.compose.service"
+
+
+@lru_cache(maxsize=1)
+def compose_command() -> tuple[str, ...]:
+    """Return the compose CLI to invoke, resolved once per process.
+
+    Prefers the standalone docker-compose binary, falling back to the
+    `docker compose` plugin.
+    """
+    if shutil.which("docker-compose"):
+        return ("docker-compose",)
+    try:
+        result = subprocess.run(
+            ["docker", "compose", "version"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+    except FileNotFoundError:
+        result = None
+    if result is None or result.returncode != 0:
+        raise RuntimeError("docker-compose command not found")
+    return ("docker", "compose")
+
+
+# Extract Host rules like Host(`example.com`)
+_HOST_RE = re.compile(r"Host\([`'\"]([^`'\"]+)[`'\"]\)")
+
+# How long a first metrics read waits for the stream's second sample, which
+# carries the CPU baseline (dockerd samples roughly once a second)
+STATS_WAIT_TIMEOUT = 5.0
+
+# Container listings are reused for this long, so one status/metrics pass over
+# many services costs a single /containers/json round-trip
+CONTAINER_LIST_TTL = 1.0
+
+# Independent daemon requests (per-container stats, network/volume setup)
+# are fanned out on a shared pool of this size
+API_WORKERS = 16
+
+# Live stats streams each hold a pooled connection; containers beyond this
+# many are read with one-shot requests instead
+MAX_STATS_STREAMS = 64
+
+# Bounds a whole per-service metrics batch so one hung container cannot stall it
+METRICS_DEADLINE = STATS_WAIT_TIMEOUT + 1.0
+
+
+def _iter_json_lines(chunks):
+    """Decode a newline-delimited JSON stream arriving in arbitrary chunks."""
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk.encode() if isinstance(chunk, str) else chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield json_loads(line)
+    if buffer.strip():
+        yield json_loads(buffer)
+
+
+def _has_cpu_baseline(stats: dict | None) -> bool:
+    return bool(stats and stats.get("precpu_stats", {}).get("system_cpu_usage"))
+
+
+def _ports_from_summary(ports: list[dict]) -> dict[str, list[dict] | None]:
+    """Reshape summary port entries into the inspect-style "80/tcp" -> bindings map."""
+    result: dict[str, list[dict] | None] = {}
+    for port in ports:
+        key = f"{port['PrivatePort']}/{port.get('Type', 'tcp')}"
+        bindings = result.setdefault(key, None)
+        if "PublicPort" in port:
+            binding = {"HostIp": port.get("IP", ""), "HostPort": str(port["PublicPort"])}
+            result[key] = [*(bindings or []), binding]
+    return result
+
+
+class _StatsStream:
+    """Follow a container's stats stream in a background thread.
+
+    Keeps only the latest sample, so reading metrics is an in-memory lookup
+    instead of a blocking two-sample stats request per call.
+    """
+
+    def __init__(self, api, container_id: str) -> None:
+        self._api = api
+        self.container_id = container_id
+        self._latest: dict | None = None
+        self._error: Exception | None = None
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._follow, name=f"stats-{container_id[:12]}", daemon=True
+        )
+        self._thread.start()
+
+    def _follow(self) -> None:
+        try:
+            # Raw chunks split on newlines: docker-py's decode=True goes through a
+            # pure-Python incremental decoder
+            chunks = self._api.stats(self.container_id, stream=True, decode=False)
+            for sample in _iter_json_lines(chunks):
+                with self._cond:
+                    self._latest = sample
+                    self._cond.notify_all()
+                if self._stopped:
+                    break
+        except Exception as e:
+            self._error = e
+        finally:
+            with self._cond:
+                self._stopped = True
+                self._cond.notify_all()
+
+    @property
+    def alive(self) -> bool:
+        return not self._stopped
+
+    def stop(self) -> None:
+        """Ask the reader to exit after the next sample arrives."""
+        self._stopped = True
+
+    def latest(self, timeout: float = STATS_WAIT_TIMEOUT) -> dict | None:
+        """Return the newest sample, waiting for one with a CPU baseline if needed."""
+        with self._cond:
+            self._cond.wait_for(lambda: _has_cpu_baseline(self._latest) or self._stopped, timeout)
+            if self._latest is None and self._error is not None:
+                raise self._error
+            return self._latest
+
+
 class DockerManager:
     """Manage Docker containers and services."""
 
     def __init__(self, socket_path: str = "unix:///var/run/docker.sock") -> None:
         self.logger = logger.bind(component="docker")
+        # Both guarded by _stats_lock, since pool workers read and update them
+        self._stats_streams: dict[str, _StatsStream] = {}
+        self._stats_lock = threading.Lock()
+        # Last cpu_stats seen per container by one-shot reads
+        self._prev_cpu: dict[str, dict] = {}
+        self._pool: ThreadPoolExecutor | None = None
+        # (listed_at, containers, containers grouped by compose service)
+        self._list_cache: tuple[float, list, dict[str, list]] | None = None
 
         try:
-            self.client = docker.from_env()
+            self.client = get_docker_client()
             self.client.ping()
             self.logger.info("Connected to Docker daemon")
         except DockerException as e:
@@ -81,19 +262,40 @@ class DockerManager:
         """Check if Docker is running in swarm mode."""
         return self.swarm_mode
 
-    def get_running_services(self) -> list[str]:
-        """Get list of running services."""
-        try:
-            containers = self.client.containers.list()
-            services = set()
-
+    def _refresh_containers(self, ttl: float = CONTAINER_LIST_TTL) -> tuple:
+        """List compose-managed containers, reusing a listing younger than ttl seconds."""
+        now = time.monotonic()
+        if self._list_cache is None or now - self._list_cache[0] >= ttl:
+            # Raw /containers/json summaries: containers.list() would inspect each
+            # container in a follow-up request. The label filter lets the daemon
+            # drop non-compose containers before they are serialized.
+            containers = self.client.api.containers(
+                all=True, filters={"label": COMPOSE_SERVICE_LABEL}
+            )
+            by_service: dict[str, list] = {}
             for container in containers:
-                # Get service name from compose label
-                service_name = container.labels.get("com.docker.compose.service")
+                service_name = (container.get("Labels") or {}).get(COMPOSE_SERVICE_LABEL)
                 if service_name:
-                    services.add(service_name)
+                    by_service.setdefault(service_name, []).append(container)
+            self._list_cache = (now, containers, by_service)
+        return self._list_cache
+
+    def _containers_by_service(self, ttl: float = CONTAINER_LIST_TTL) -> dict[str, list]:
+        """Group the (cached) container listing by compose service name."""
+        return self._refresh_containers(ttl)[2]
 
-            return list(services)
+    def invalidate_container_cache(self) -> None:
+        """Drop the cached container listing (e.g. after scaling)."""
+        self._list_cache = None
+
+    def get_running_services(self) -> list[str]:
+        """Get list of running services."""
+        try:
+            return [
+                name
+                for name, containers in self._containers_by_service().items()
+                if any(c.get("State") == "running" for c in containers)
+            ]
         except DockerException as e:
             self.logger.error(f"Failed to get running services: {e}")
             return []
@@ -101,18 +303,20 @@ class DockerManager:
     def get_service_containers(self, service_name: str) -> list[ContainerInfo]:
         """Get containers for a specific service."""
         try:
-            containers = self.client.containers.list(all=True)
-            service_containers = []
-
-            for container in containers:
-                if container.labels.get("com.docker.compose.service") == service_name:
-                    info = self._container_to_info(container)
-                    service_containers.append(info)
+            containers = self._containers_by_service().get(service_name, [])
+            return [self._container_to_info(container) for container in containers]
+        except DockerException as e:
+            self.logger.error(f"Failed to get containers for service {service_name}: {e}")
+            return []
 
-            return service_containers
+    def _service_container_states(self, service_name: str) -> list[tuple[str, str]]:
+        """Return (id, state) for a service's containers without building ContainerInfo."""
+        try:
+            containers = self._containers_by_service().get(service_name, [])
         except DockerException as e:
             self.logger.error(f"Failed to get containers for service {service_name}: {e}")
             return []
+        return [(c["Id"], c.get("State") or "unknown") for c in containers]
 
     def get_service_status(self, service_name: str) -> ServiceStatus | None:
         """Get status information for a service."""
@@ -121,27 +325,55 @@ class DockerManager:
         if not containers:
             return None
 
-        running_containers = len([c for c in containers if c.state == "running"])
+        return self._build_service_status(service_name, containers)
+
+    def get_all_service_statuses(self, service_names=None) -> dict[str, ServiceStatus]:
+        """
+        Get status information for several services with a single container listing.
+
+        With service_names=None every compose service found is reported;
+        services without containers are left out of the result.
+        """
+        try:
+            by_service = self._containers_by_service()
+        except DockerException as e:
+            self.logger.error(f"Failed to list containers: {e}")
+            return {}
+
+        if service_names is not None:
+            wanted = set(service_names)
+            by_service = {name: c for name, c in by_service.items() if name in wanted}
+
+        return {
+            name: self._build_service_status(name, [self._container_to_info(c) for c in containers])
+            for name, containers in by_service.items()
+        }
+
+    def _build_service_status(
+        self, service_name: str, containers: list[ContainerInfo]
+    ) -> ServiceStatus:
+        """Summarize a service's containers into a ServiceStatus."""
+        running_containers = sum(c.state == "running" for c in containers)
         total_containers = len(containers)
 
-        # Extract ports and domains from containers
-        ports = set()
-        domains = set()
-
-        for container in containers:
-            # Get ports
-            for port_info in container.ports.values():
-                if port_info:
-                    for port in port_info:
-                        if port.get("HostPort"):
-                            ports.add(int(port["HostPort"]))
-
-            # Extract domains from Traefik labels
-            for key, value in container.labels.items():
-                if "traefik.http.routers" in key and key.endswith(".rule"):
-                    domain = self._extract_domain_from_rule(value)
-                    if domain:
-                        domains.add(domain)
+        # Published host ports across all containers
+        ports = {
+            int(port["HostPort"])
+            for container in containers
+            for bindings in container.ports.values()
+            if bindings
+            for port in bindings
+            if port.get("HostPort")
+        }
+
+        # Domains from Traefik router Host rules
+        domains = {
+            domain
+            for container in containers
+            for key, value in container.labels.items()
+            if key.startswith(ROUTER_PREFIX) and key.endswith(".rule") and "Host(" in value
+            if (domain := self._extract_domain_from_rule(value))
+        }
 
         # Check scaling configuration
         first_container = containers[0]
@@ -156,7 +388,7 @@ class DockerManager:
         else:
             health_status = "healthy"
 
-        return ServiceStatus(
+        return ServiceStatus.model_construct(
             name=service_name,
             running_containers=running_containers,
             total_containers=total_containers,
@@ -171,9 +403,8 @@ class DockerManager:
     def scale_compose_service(self, service_name: str, replicas: int, compose_file: Path) -> None:
         """Scale a service using docker-compose."""
         try:
-            # Try docker-compose first
             cmd = [
-                "docker-compose",
+                *compose_command(),
                 "-f",
                 str(compose_file),
                 "up",
@@ -182,16 +413,12 @@ class DockerManager:
                 f"{service_name}={replicas}",
                 "--no-recreate",
             ]
+            # Only stderr is read (for the error message)
+            subprocess.run(
+                cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+            )
 
-            result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-
-            if result.returncode != 0:
-                # Try docker compose (newer syntax)
-                cmd[0] = "docker"
-                cmd.insert(1, "compose")
-
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
+            self.invalidate_container_cache()
             self.logger.info(f"Scaled service {service_name} to {replicas} replicas")
 
         except subprocess.CalledProcessError as e:
@@ -205,8 +432,11 @@ class DockerManager:
         """Scale a service in Docker Swarm."""
         try:
             cmd = ["docker", "service", "scale", f"{service_name}={replicas}"]
-            subprocess.run(cmd, capture_output=True, text=True, check=True)
+            subprocess.run(
+                cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+            )
 
+            self.invalidate_container_cache()
             self.logger.info(f"Scaled swarm service {service_name} to {replicas} replicas")
 
         except subprocess.CalledProcessError as e:
@@ -214,99 +444,198 @@ class DockerManager:
             self.logger.error(error_msg)
             raise RuntimeError(error_msg) from e
 
-    def get_container_metrics(self, container_id: str) -> ContainerMetrics | None:
-        """Get metrics for a container."""
+    def get_container_metrics(
+        self, container_id: str, stream: bool = True
+    ) -> ContainerMetrics | None:
+        """Get metrics for a container.
+
+        With stream=True the first call starts following the container's stats
+        stream and waits for a usable sample; later calls read the latest one.
+        With stream=False, or once MAX_STATS_STREAMS streams are live, a single
+        one-shot stats request is made and CPU usage is computed against the
+        previous one-shot read (0% on the first).
+        """
         try:
-            container = self.client.containers.get(container_id)
-            stats = container.stats(stream=False)
-
-            # Parse CPU stats
-            cpu_stats = stats["cpu_stats"]
-            precpu_stats = stats["precpu_stats"]
-
-            cpu_usage = cpu_stats["cpu_usage"]
-            precpu_usage = precpu_stats["cpu_usage"]
-
-            cpu_delta = cpu_usage["total_usage"] - precpu_usage["total_usage"]
-            system_delta = cpu_stats.get("system_cpu_usage", 0) - precpu_stats.get(
-                "system_cpu_usage", 0
-            )
-
-            if system_delta > 0:
-                online_cpus = len(cpu_usage.get("percpu_usage", [1]))
-                cpu_percent = (cpu_delta / system_delta) * online_cpus * 100
+            stats_stream = self._stats_stream(container_id) if stream else None
+            if stats_stream is not None:
+                stats = stats_stream.latest()
             else:
-                cpu_percent = 0.0
-
-            # Parse memory stats
-            memory_stats = stats["memory_stats"]
-            memory_usage = memory_stats.get("usage", 0)
-            memory_limit = memory_stats.get("limit", 1)
-            memory_percent = (memory_usage / memory_limit) * 100
-
-            # Parse network stats
-            networks = stats.get("networks", {})
-            total_rx = sum(net.get("rx_bytes", 0) for net in networks.values())
-            total_tx = sum(net.get("tx_bytes", 0) for net in networks.values())
-
-            return ContainerMetrics(
-                container_id=container_id,
-                name=container.name,
-                cpu_percent=cpu_percent,
-                memory_usage=memory_usage,
-                memory_limit=memory_limit,
-                memory_percent=memory_percent,
-                network_rx_bytes=total_rx,
-                network_tx_bytes=total_tx,
-                timestamp=stats.get("read", ""),
-            )
+                stats = self._one_shot_stats(container_id)
+            if stats is None:
+                self.logger.warning(f"No stats received for container {container_id}")
+                return None
+            return self._metrics_from_stats(container_id, stats)
 
         except (DockerException, KeyError) as e:
             self.logger.error(f"Failed to get metrics for container {container_id}: {e}")
             return None
 
+    def _one_shot_stats(self, container_id: str) -> dict:
+        """Fetch raw counters without dockerd's two-sample wait."""
+        api = self.client.api
+        # Same request as api.stats(stream=False, one_shot=True), but decoding the
+        # raw body with json_loads instead of requests' response.json()
+        response = api._get(
+            api._url("/containers/{0}/stats", container_id),
+            params={"stream": False, "one-shot": True},
+        )
+        stats = json_loads(api._result(response, binary=True))
+        cpu_stats = stats["cpu_stats"]
+        # Diffing a sample against itself yields 0% until a baseline exists
+        with self._stats_lock:
+            stats["precpu_stats"] = self._prev_cpu.get(container_id, cpu_stats)
+            self._prev_cpu[container_id] = cpu_stats
+        return stats
+
+    def _stats_stream(self, container_id: str) -> _StatsStream | None:
+        """Return the live stats stream for a container, starting one if needed.
+
+        Returns None once MAX_STATS_STREAMS streams are live.
+        """
+        with self._stats_lock:
+            stream = self._stats_streams.get(container_id)
+            if stream is None or not stream.alive:
+                if sum(s.alive for s in self._stats_streams.values()) >= MAX_STATS_STREAMS:
+                    return None
+                stream = _StatsStream(self.client.api, container_id)
+                self._stats_streams[container_id] = stream
+            return stream
+
+    def stop_stats_streams(self, container_ids=None) -> None:
+        """Stop following stats for the given containers (all if None)."""
+        with self._stats_lock:
+            if container_ids is None:
+                # Snapshot the keys under the lock; workers add entries concurrently
+                container_ids = [*self._stats_streams, *self._prev_cpu]
+            for container_id in container_ids:
+                self._prev_cpu.pop(container_id, None)
+                stream = self._stats_streams.pop(container_id, None)
+                if stream is not None:
+                    stream.stop()
+
+    @staticmethod
+    def _metrics_from_stats(container_id: str, stats: dict) -> ContainerMetrics:
+        """Build ContainerMetrics from a raw stats sample."""
+        # Parse CPU stats
+        cpu_stats = stats["cpu_stats"]
+        precpu_stats = stats["precpu_stats"]
+
+        cpu_usage = cpu_stats["cpu_usage"]
+        precpu_usage = precpu_stats["cpu_usage"]
+
+        cpu_delta = cpu_usage["total_usage"] - precpu_usage["total_usage"]
+        system_delta = cpu_stats.get("system_cpu_usage", 0) - precpu_stats.get(
+            "system_cpu_usage", 0
+        )
+
+        if system_delta > 0:
+            # online_cpus is reported since API 1.27; percpu_usage is absent on
+            # cgroup v2 hosts
+            online_cpus = (
+                cpu_stats.get("online_cpus")
+                or len(cpu_usage.get("percpu_usage") or ())
+                or os.cpu_count()
+                or 1
+            )
+            cpu_percent = (cpu_delta / system_delta) * online_cpus * 100
+        else:
+            cpu_percent = 0.0
+
+        # Parse memory stats
+        memory_stats = stats["memory_stats"]
+        memory_usage = memory_stats.get("usage", 0)
+        memory_limit = memory_stats.get("limit", 1)
+        memory_percent = (memory_usage / memory_limit) * 100
+
+        # Parse network stats
+        networks = stats.get("networks", {})
+        total_rx = sum(net.get("rx_bytes", 0) for net in networks.values())
+        total_tx = sum(net.get("tx_bytes", 0) for net in networks.values())
+
+        return ContainerMetrics.model_construct(
+            container_id=container_id,
+            name=stats.get("name", "").lstrip("/"),
+            cpu_percent=cpu_percent,
+            memory_usage=memory_usage,
+            memory_limit=memory_limit,
+            memory_percent=memory_percent,
+            network_rx_bytes=total_rx,
+            network_tx_bytes=total_tx,
+            timestamp=stats.get("read", ""),
+        )
+
     def get_service_metrics(self, service_name: str) -> list[ContainerMetrics]:
         """Get aggregated metrics for all containers in a service."""
-        containers = self.get_service_containers(service_name)
-        metrics = []
+        containers = self._service_container_states(service_name)
+        running = [cid for cid, state in containers if state == "running"]
+
+        futures = [self._executor().submit(self.get_container_metrics, cid) for cid in running]
+        done, not_done = wait(futures, timeout=METRICS_DEADLINE)
+        if not_done:
+            self.logger.warning(
+                f"Timed out reading metrics for {len(not_done)} container(s) of {service_name}"
+            )
+        # Keep container order; skip reads that failed or missed the deadline
+        metrics = [m for f in futures if f in done and (m := f.result())]
 
-        for container in containers:
-            if container.state == "running":
-                container_metrics = self.get_container_metrics(container.id)
-                if container_metrics:
-                    metrics.append(container_metrics)
+        # Stop following containers of this service that are no longer running
+        self.stop_stats_streams([cid for cid, state in containers if state != "running"])
 
         return metrics
 
+    def _executor(self) -> ThreadPoolExecutor:
+        """Return the manager's shared worker pool, created on first use."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="docker")
+        return self._pool
+
     def create_networks(self, networks: list[str]) -> None:
         """Create Docker networks if they don't exist."""
-        for network_name in networks:
+        # Each name is an independent get/create round-trip; map() waits for all
+        list(self._executor().map(self._ensure_network, networks))
+
+    def _ensure_network(self, network_name: str) -> None:
+        try:
+            self.client.networks.get(network_name)
+            self.logger.debug(f"Network {network_name} already exists")
+        except NotFound:
             try:
-                self.client.networks.get(network_name)
-                self.logger.debug(f"Network {network_name} already exists")
-            except NotFound:
-                try:
-                    self.client.networks.create(network_name, driver="bridge")
-                    self.logger.info(f"Created network: {network_name}")
-                except APIError as e:
-                    self.logger.warning(f"Failed to create network {network_name}: {e}")
+                self.client.networks.create(network_name, driver="bridge")
+                self.logger.info(f"Created network: {network_name}")
+            except APIError as e:
+                self.logger.warning(f"Failed to create network {network_name}: {e}")
 
     def clean_system(self) -> None:
         """Clean up Docker system."""
         try:
-            # Prune containers
+            # Containers go first: stopped containers still hold their images,
+            # networks and volumes
             self.client.containers.prune()
-            # Prune images
-            self.client.images.prune()
-            # Prune networks
-            self.client.networks.prune()
-            # Prune volumes
-            self.client.volumes.prune()
-            self.logger.info("Cleaned up Docker system")
+            self.invalidate_container_cache()
         except DockerException as e:
             self.logger.error(f"Failed to clean Docker system: {e}")
             raise RuntimeError(f"Failed to clean Docker system: {e}") from e
 
+        # The remaining pruners are independent; run them together and report
+        # every failure rather than stopping at the first
+        pruners = {
+            "images": self.client.images.prune,
+            "networks": self.client.networks.prune,
+            "volumes": self.client.volumes.prune,
+        }
+        futures = {kind: self._executor().submit(prune) for kind, prune in pruners.items()}
+        errors = []
+        for kind, future in futures.items():
+            try:
+                future.result()
+            except DockerException as e:
+                self.logger.error(f"Failed to prune {kind}: {e}")
+                errors.append(f"{kind}: {e}")
+
+        if errors:
+            raise RuntimeError(f"Failed to clean Docker system: {'; '.join(errors)}")
+        self.logger.info("Cleaned up Docker system")
+
     def clean_volumes(self) -> None:
         """Clean up unused Docker volumes."""
         try:
@@ -334,62 +663,72 @@ class DockerManager:
             "alertmanager_data",
         ]
 
-        for volume_name in required_volumes:
+        list(self._executor().map(self._ensure_volume, required_volumes))
+
+    def _ensure_volume(self, volume_name: str) -> None:
+        try:
+            self.client.volumes.get(volume_name)
+            self.logger.debug(f"Volume {volume_name} already exists")
+        except NotFound:
             try:
-                self.client.volumes.get(volume_name)
-                self.logger.debug(f"Volume {volume_name} already exists")
-            except NotFound:
-                try:
-                    self.client.volumes.create(volume_name)
-                    self.logger.info(f"Created volume: {volume_name}")
-                except APIError as e:
-                    self.logger.warning(f"Failed to create volume {volume_name}: {e}")
-
-    def _container_to_info(self, container) -> ContainerInfo:
-        """Convert Docker container to ContainerInfo."""
-        # Get service name from labels
-        service_name = container.labels.get("com.docker.compose.service")
-
-        # Get networks
-        networks = list(container.attrs.get("NetworkSettings", {}).get("Networks", {}).keys())
-
-        return ContainerInfo(
-            id=container.id,
-            name=container.name,
-            service_name=service_name,
-            image=container.image.tags[0] if container.image.tags else "unknown",
-            status=container.status,
-            state=container.attrs.get("State", {}).get("Status", "unknown"),
-            ports=container.ports,
-            labels=container.labels,
-            networks=networks,
-            created=container.attrs.get("Created", ""),
+                self.client.volumes.create(volume_name)
+                self.logger.info(f"Created volume: {volume_name}")
+            except APIError as e:
+                self.logger.warning(f"Failed to create volume {volume_name}: {e}")
+
+    def _container_to_info(self, container: dict) -> ContainerInfo:
+        """Convert a /containers/json summary to ContainerInfo."""
+        labels = container.get("Labels") or {}
+        names = container.get("Names") or []
+        networks = (container.get("NetworkSettings") or {}).get("Networks") or {}
+        created = container.get("Created")
+        state = container.get("State") or "unknown"
+        # Image is the reference the container was created from; containers of
+        # since-retagged images only report the bare image ID
+        image = container.get("Image") or ""
+        if not image or image.startswith("sha256:"):
+            image = "unknown"
+
+        return ContainerInfo.model_construct(
+            id=container["Id"],
+            name=names[0].lstrip("/") if names else container["Id"][:12],
+            service_name=labels.get(COMPOSE_SERVICE_LABEL),
+            image=image,
+            status=state,
+            state=state,
+            ports=_ports_from_summary(container.get("Ports") or []),
+            labels=labels,
+            networks=list(networks),
+            created=datetime.fromtimestamp(created, timezone.utc).isoformat() if created else "",
         )
 
     def _extract_domain_from_rule(self, rule: str) -> str | None:
         """Extract domain from Traefik rule."""
-        import re
-
-        # Extract Host rules like Host(`example.com`)
-        host_pattern = r"Host\([`'\"]([^`'\"]+)[`'\"]\)"
-        match = re.search(host_pattern, rule)
-
-        if match:
-            return match.group(1)
-
-        return None
+        match = _HOST_RE.search(rule)
+        return match.group(1) if match else None
 
     def get_compose_services(self, compose_file: Path) -> list[str]:
         """Get list of services defined in docker-compose file."""
         try:
-            # Try docker-compose
-            cmd = ["docker-compose", "-f", str(compose_file), "config", "--services"]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+            data = read_compose(compose_file)
+        except (OSError, yaml.YAMLError) as e:
+            self.logger.error(f"Failed to read compose file {compose_file}: {e}")
+            return []
 
-            if result.returncode != 0:
-                # Try docker compose
-                cmd = ["docker", "compose", "-f", str(compose_file), "config", "--services"]
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        services = data.get("services") or {}
+        # include/extends pull in services from other files, which only compose
+        # itself resolves
+        if "include" in data or any(
+            isinstance(spec, dict) and "extends" in spec for spec in services.values()
+        ):
+            return self._compose_config_services(compose_file)
+        return list(services)
+
+    def _compose_config_services(self, compose_file: Path) -> list[str]:
+        """List services via `compose config --services`."""
+        try:
+            cmd = [*compose_command(), "-f", str(compose_file), "config", "--services"]
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
 
             services = [line.strip() for line in result.stdout.splitlines() if line.strip()]
             return services
@@ -397,6 +736,6 @@ class DockerManager:
         except subprocess.CalledProcessError as e:
             self.logger.error(f"Failed to get compose services: {e.stderr}")
             return []
-        except FileNotFoundError:
-            self.logger.error("docker-compose command not found")
+        except RuntimeError as e:
+            self.logger.error(str(e))
             return []
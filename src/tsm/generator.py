@@ -1,18 +1,34 @@
 """Traefik configuration generator."""
 
+import copy
 import shutil
+from functools import cache
 from pathlib import Path
 from typing import Any, Literal, TextIO
 
 import yaml
 from loguru import logger
 
+from .certs import CA_CONFIG_TEMPLATE, CA_CSR_TEMPLATE, CSR_TEMPLATE, template_json
 from .config import Config
 from .discovery import Service
+from .utils import YamlDumper, YamlLoader
 
 TEMPLATE_DIR = Path(__file__).parent.parent.parent / "templates"
 
 
+@cache
+def _read_template(name: str) -> str:
+    """Read a template file once per process; templates ship with the package."""
+    return (TEMPLATE_DIR / name).read_text()
+
+
+@cache
+def _middleware_template() -> dict[str, Any]:
+    """Parsed middleware template, shared; callers get a deep copy."""
+    return yaml.load(_read_template("middleware.yml"), Loader=YamlLoader)
+
+
 class ConfigGenerator:
     """Generate Traefik configuration from discovered services."""
 
@@ -55,12 +71,12 @@ class ConfigGenerator:
         }
 
         for service in services:
-            # HTTP routers/services
-            if service.traefik_enabled and not self._is_tcp_service(service):
-                self._add_service_config(http_config, service)
-            # TCP routers/services
             if self._is_tcp_service(service):
+                # TCP routers/services
                 self._add_tcp_service_config(tcp_config, service)
+            elif service.traefik_enabled:
+                # HTTP routers/services
+                self._add_service_config(http_config, service)
 
         # Add default middlewares to HTTP only if there are any routers or services
         if http_config["routers"] or http_config["services"]:
@@ -94,32 +110,21 @@ class ConfigGenerator:
         # Generate service configuration
         service_config = {"loadBalancer": {"servers": []}}
         address_set = False
-        # Find all address labels
-        address_labels = [
-            (k, v)
-            for k, v in service.labels.items()
-            if k.startswith("traefik.http.services.") and k.endswith(".loadbalancer.server.address")
-        ]
+        traefik_labels = service.traefik_labels
+        # All address labels, keyed by label
+        address_labels = traefik_labels.http_addresses
         # Prefer one matching the service name (hyphen or underscore)
-        preferred_keys = [
+        preferred_keys = (
             f"traefik.http.services.{service.name}.loadbalancer.server.address",
             f"traefik.http.services.{service.name.replace('_', '-')}.loadbalancer.server.address",
             f"traefik.http.services.{service.name.replace('-', '_')}.loadbalancer.server.address",
-        ]
-        selected_label = None
-        selected_value = None
-        for key in preferred_keys:
-            for k, v in address_labels:
-                if k == key:
-                    selected_label = k
-                    selected_value = v
-                    break
-            if selected_label:
-                break
+        )
+        selected_label = next((key for key in preferred_keys if key in address_labels), None)
         # If no preferred, use the first found
-        if not selected_label and address_labels:
-            selected_label, selected_value = address_labels[0]
-        if selected_label:
+        if selected_label is None and address_labels:
+            selected_label = next(iter(address_labels))
+        if selected_label is not None:
+            selected_value = address_labels[selected_label]
             if not selected_value.startswith("http://"):
                 selected_value = f"http://{selected_value}"
             service_config["loadBalancer"]["servers"].append({"url": selected_value})
@@ -129,8 +134,9 @@ class ConfigGenerator:
             )
         # If no address, check for port label
         if not address_set:
-            for k, v in service.labels.items():
-                if k.startswith(f"traefik.http.services.{service_name}.loadbalancer.server.port"):
+            port_prefix = f"traefik.http.services.{service_name}.loadbalancer.server.port"
+            for k, v in traefik_labels.http_ports:
+                if k.startswith(port_prefix):
                     port = v
                     host = self.default_backend_host or service.name
                     url = f"http://{host}:{port}"
@@ -342,10 +348,7 @@ class ConfigGenerator:
     def generate_middleware_config(self) -> dict[str, Any]:
         """Generate middleware configuration."""
 
-        with open(TEMPLATE_DIR / "middleware.yml") as f:
-            middleware_template = yaml.safe_load(f)
-
-        return middleware_template
+        return copy.deepcopy(_middleware_template())
 
     def generate_static_config(self) -> dict[str, Any]:
         """Generate Traefik static configuration."""
@@ -368,15 +371,11 @@ class ConfigGenerator:
 
     def generate_docker_compose_file(self) -> str:
         """Generate docker-compose.yml file."""
-        with open(TEMPLATE_DIR / "docker-compose.yml") as f:
-            docker_compose_template = f.read()
-        return docker_compose_template
+        return _read_template("docker-compose.yml")
 
     def generate_scaling_rules_file(self) -> str:
         """Generate scaling-rules.yml file."""
-        with open(TEMPLATE_DIR / "scaling-rules.yml") as f:
-            scaling_rules_template = f.read()
-        return scaling_rules_template
+        return _read_template("scaling-rules.yml")
 
     def copy_dockerfiles_to_output(self, output_dir: Path) -> None:
         """Copy Dockerfiles to output directory."""
@@ -413,6 +412,7 @@ class ConfigGenerator:
             sort_keys=False,
             allow_unicode=True,
             indent=2,
+            Dumper=YamlDumper,
         )
 
     def write_config_files(
@@ -479,62 +479,33 @@ class ConfigGenerator:
 
     def _is_tcp_service(self, service: Service) -> bool:
         """Detect if a service should be routed as TCP based on labels."""
-        # Check for traefik.tcp.* labels or scheme=tcp
-        for k, v in service.labels.items():
-            if k.startswith("traefik.tcp."):
-                return True
-            if (
-                k.startswith("traefik.http.services.")
-                and ".loadbalancer.server.scheme" in k
-                and v.strip().lower() == "tcp"
-            ):
-                return True
-        return False
+        # traefik.tcp.* labels or an HTTP service scheme of tcp
+        return service.traefik_labels.is_tcp
 
     def _add_tcp_service_config(self, tcp_config: dict[str, Any], service: Service) -> None:
         """Add TCP router and service config from labels."""
         routers = {}
         services = {}
-        for k, v in service.labels.items():
-            if k.startswith("traefik.tcp.routers."):
-                parts = k.split(".")
-                if len(parts) >= 4:
-                    router_name = parts[3]
-                    subkey = ".".join(parts[4:]) if len(parts) > 4 else None
-                    if router_name not in routers:
-                        routers[router_name] = {}
-                    if subkey:
-                        if subkey == "entrypoints":
-                            routers[router_name]["entryPoints"] = [
-                                ep.strip() for ep in v.split(",")
-                            ]
-                        else:
-                            routers[router_name][subkey] = v
-            elif k.startswith("traefik.tcp.services."):
-                parts = k.split(".")
-                if len(parts) >= 4:
-                    service_name = parts[3]
-                    subkey = ".".join(parts[4:]) if len(parts) > 4 else None
-                    if service_name not in services:
-                        services[service_name] = {"loadBalancer": {"servers": []}}
-                    if subkey == "loadbalancer.server.address":
-                        services[service_name]["loadBalancer"]["servers"].append({"address": v})
-                    elif subkey == "loadbalancer.server.port":
-                        # Only add if address not already set
-                        if not any(
-                            "address" in s
-                            for s in services[service_name]["loadBalancer"]["servers"]
-                        ):
-                            port = v
-                            host = self.default_backend_host or service.name
-                            address = f"{host}:{port}"
-                            services[service_name]["loadBalancer"]["servers"].append(
-                                {"address": address}
-                            )
-        for router_name, router in routers.items():
-            tcp_config["routers"][router_name] = router
-        for service_name, svc in services.items():
-            tcp_config["services"][service_name] = svc
+        traefik_labels = service.traefik_labels
+        for router_name, subkey, v in traefik_labels.tcp_routers:
+            router = routers.setdefault(router_name, {})
+            if subkey:
+                if subkey == "entrypoints":
+                    router["entryPoints"] = [ep.strip() for ep in v.split(",")]
+                else:
+                    router[subkey] = v
+        for service_name, subkey, v in traefik_labels.tcp_services:
+            svc = services.setdefault(service_name, {"loadBalancer": {"servers": []}})
+            servers = svc["loadBalancer"]["servers"]
+            if subkey == "loadbalancer.server.address":
+                servers.append({"address": v})
+            elif subkey == "loadbalancer.server.port":
+                # Only add if address not already set
+                if not any("address" in s for s in servers):
+                    host = self.default_backend_host or service.name
+                    servers.append({"address": f"{host}:{v}"})
+        tcp_config["routers"].update(routers)
+        tcp_config["services"].update(services)
 
     def generate_cert_templates(self, cert_config_dir: Path, force: bool = False) -> list[Path]:
         """Generate CA and CSR template files for certificate generation."""
@@ -543,91 +514,16 @@ class ConfigGenerator:
         ca_config = cert_config_dir / "ca-config.json"
         ca_csr = cert_config_dir / "ca-csr.json"
         csr_template = cert_config_dir / "csr-template.json"
-        ca_config_content = """{
-  "signing": {
-    "default": {
-      "expiry": "8760h"
-    },
-    "profiles": {
-      "server": {
-        "usages": [
-          "signing",
-          "key encipherment",
-          "server auth",
-          "client auth"
-        ],
-        "expiry": "8760h"
-      },
-      "client": {
-        "usages": [
-          "signing",
-          "key encipherment",
-          "client auth"
-        ],
-        "expiry": "8760h"
-      },
-      "peer": {
-        "usages": [
-          "signing",
-          "key encipherment",
-          "server auth",
-          "client auth"
-        ],
-        "expiry": "8760h"
-      }
-    }
-  }
-}
-"""
-        ca_csr_content = """{
-  "CN": "FinancialPayments CA",
-  "key": {
-    "algo": "rsa",
-    "size": 2048
-  },
-  "names": [
-    {
-      "C": "US",
-      "L": "San Francisco",
-      "O": "FinancialPayments",
-      "OU": "CA",
-      "ST": "California"
-    }
-  ]
-}
-"""
-        csr_template_content = """{
-  "CN": "COMMON_NAME",
-  "hosts": [
-    "HOSTS"
-  ],
-  "key": {
-    "algo": "ecdsa",
-    "size": 256
-  },
-  "names": [
-    {
-      "C": "US",
-      "L": "Texas",
-      "O": "etcd",
-      "ST": "California"
-    }
-  ]
-}
-"""
         if force or not ca_config.exists():
-            with open(ca_config, "w") as f:
-                f.write(ca_config_content)
+            ca_config.write_bytes(template_json(CA_CONFIG_TEMPLATE))
             self.logger.info(f"Created {ca_config}")
             created.append(ca_config)
         if force or not ca_csr.exists():
-            with open(ca_csr, "w") as f:
-                f.write(ca_csr_content)
+            ca_csr.write_bytes(template_json(CA_CSR_TEMPLATE))
             self.logger.info(f"Created {ca_csr}")
             created.append(ca_csr)
         if force or not csr_template.exists():
-            with open(csr_template, "w") as f:
-                f.write(csr_template_content)
+            csr_template.write_bytes(template_json(CSR_TEMPLATE))
             self.logger.info(f"Created {csr_template}")
             created.append(csr_template)
         return created
@@ -676,7 +572,7 @@ class ConfigGenerator:
                 import yaml
 
                 with open(scaling_file, "w") as f:
-                    yaml.dump(scaling_rules, f, default_flow_style=False)
+                    yaml.dump(scaling_rules, f, default_flow_style=False, Dumper=YamlDumper)
                 created_files.append(scaling_file)
 
         if template in ["all", "certs"]:
@@ -42,9 +42,17 @@ class AutoScaler:
         discovery = ServiceDiscovery()
         services = discovery.discover_services(self.compose_file_path)
         scalable_services = discovery.get_scalable_services(services)
+        # One container listing per check instead of up to two per service
+        statuses = self.docker_manager.get_all_service_statuses(s.name for s in scalable_services)
         for service in scalable_services:
             name = service.name
             scaling = service.scaling_config
+            status = statuses.get(name)
+            if status is None:
+                # No containers: nothing to scale relative to
+                self.logger.debug(f"No status for {name}, skipping")
+                continue
+            replicas = status.replicas
             cpu = self.prometheus.get_cpu(name, config.prometheus.cpu_query)
             mem = self.prometheus.get_memory(name, config.prometheus.memory_query)
             if cpu is None and mem is None:
@@ -52,17 +60,10 @@ class AutoScaler:
             metric = cpu if cpu is not None else mem
             desired = None
             if metric > scaling.scale_up_threshold and service.scaling_config.max_replicas > 0:
-                desired = min(
-                    self.docker_manager.get_service_status(name).replicas + 1, scaling.max_replicas
-                )
+                desired = min(replicas + 1, scaling.max_replicas)
             elif metric < scaling.scale_down_threshold and service.scaling_config.min_replicas > 0:
-                desired = max(
-                    self.docker_manager.get_service_status(name).replicas - 1, scaling.min_replicas
-                )
-            if (
-                desired is not None
-                and desired != self.docker_manager.get_service_status(name).replicas
-            ):
+                desired = max(replicas - 1, scaling.min_replicas)
+            if desired is not None and desired != replicas:
                 if self.dry_run:
                     self.logger.info(f"[Dry Run] Would scale {name} to {desired} replicas")
                 else:
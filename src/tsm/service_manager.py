@@ -9,6 +9,7 @@ from .docker_client import DockerManager
 from .generator import ConfigGenerator
 from .monitoring import PrometheusClient
 from .scaling import AutoScaler
+from .utils import YamlDumper
 
 
 class ServiceManager:
@@ -89,7 +90,9 @@ class ServiceManager:
         with open(config_file, "w") as f:
             import yaml
 
-            yaml.dump(config, f, sort_keys=False, default_flow_style=False, indent=2)
+            yaml.dump(
+                config, f, sort_keys=False, default_flow_style=False, indent=2, Dumper=YamlDumper
+            )
         logger.info(f"Generated Traefik config at {config_file}")
         return config
 
@@ -1,14 +1,46 @@
 """Utility functions for TSM."""
 
+import logging
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from loguru import logger
 
+# libyaml-backed loader/dumper when PyYAML was built with it, pure Python otherwise
+try:
+    from yaml import CSafeDumper as YamlDumper
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as YamlDumper  # noqa: F401
+    from yaml import SafeLoader as YamlLoader  # noqa: F401
 
-def setup_logging(level: str = "INFO") -> None:
-    """Setup logging configuration."""
+
+class InterceptHandler(logging.Handler):
+    """Forward stdlib logging records (docker SDK, urllib3, ...) to loguru."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            level: str | int = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+
+        # Report the caller that logged, not the logging module itself
+        frame, depth = logging.currentframe(), 2
+        while frame and frame.f_code.co_filename == logging.__file__:
+            frame = frame.f_back
+            depth += 1
+
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+
+def setup_logging(level: str = "INFO", log_files: bool = True) -> None:
+    """Setup logging configuration.
+
+    Everything goes through loguru; stdlib logging is routed into it and
+    filtered at the same level, so records below it are never formatted.
+    """
 
     # Remove default handler
     logger.remove()
@@ -21,8 +53,11 @@ def setup_logging(level: str = "INFO") -> None:
         "<level>{level: <8}</level> | "
         "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
         "<level>{message}</level>",
-        colorize=True,
     )
+    logging.basicConfig(handlers=[InterceptHandler()], level=level, force=True)
+
+    if not log_files:
+        return
 
     # Add file handler for errors
     log_dir = Path("logs")
@@ -46,8 +81,9 @@ def setup_logging(level: str = "INFO") -> None:
     )
 
 
+@lru_cache(maxsize=1)
 def get_local_ip() -> str | None:
-    """Get local IP address."""
+    """Get local IP address (detected once per process)."""
     import socket
 
     try:
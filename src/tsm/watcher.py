@@ -1,17 +1,22 @@
-import time
+import os
+import threading
 from pathlib import Path
 
 from loguru import logger
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
+# Editors typically emit several events per save (truncate, write, rename);
+# coalesce anything arriving within this window into a single callback.
+DEBOUNCE_SECONDS = 0.2
+
 
 class FileWatcher:
-    def __init__(self, file_path: Path, callback):
-        self.file_path = Path(file_path)
+    def __init__(self, file_path: Path, callback, debounce: float = DEBOUNCE_SECONDS):
+        self.file_path = Path(file_path).resolve()
         self.callback = callback
         self._observer = Observer()
-        self._event_handler = _FileChangeHandler(self.file_path, self.callback)
+        self._event_handler = _FileChangeHandler(self.file_path, self.callback, debounce)
         self._running = False
 
     def start(self):
@@ -23,29 +28,51 @@ class FileWatcher:
             self._observer.start()
             self._running = True
             try:
-                while self._running:
-                    time.sleep(0.5)
+                # Block on the observer thread instead of waking up on a timer;
+                # the timeout only keeps Ctrl-C responsive.
+                while self._running and self._observer.is_alive():
+                    self._observer.join(1)
             except KeyboardInterrupt:
                 self.stop()
 
     def stop(self):
         if self._running:
             logger.debug(f"Stopping watcher for {self.file_path}")
+            self._event_handler.cancel()
             self._observer.stop()
             self._observer.join()
             self._running = False
 
 
 class _FileChangeHandler(FileSystemEventHandler):
-    def __init__(self, file_path: Path, callback):
+    def __init__(self, file_path: Path, callback, debounce: float = DEBOUNCE_SECONDS):
         super().__init__()
-        self.file_path = file_path.resolve()
+        # The parent directory is scheduled already resolved, so event paths
+        # can be compared as plain strings without a realpath per event.
+        self.file_path = str(file_path)
         self.callback = callback
+        self.debounce = debounce
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def _trigger(self, event_type: str):
+        logger.debug(f"Detected {event_type} event for {self.file_path}")
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self.callback)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
 
     def _handle(self, event):
-        if Path(event.src_path).resolve() == self.file_path:
-            logger.debug(f"Detected {event.event_type} event for {self.file_path}")
-            self.callback()
+        if os.fsdecode(event.src_path) == self.file_path:
+            self._trigger(event.event_type)
 
     def on_modified(self, event):
         self._handle(event)
@@ -54,9 +81,8 @@ class _FileChangeHandler(FileSystemEventHandler):
         self._handle(event)
 
     def on_moved(self, event):
-        # event.dest_path is the new path after move
-        if Path(getattr(event, "dest_path", "")) == self.file_path:
-            logger.debug(f"Detected moved event to {self.file_path}")
-            self.callback()
+        # event.dest_path is the new path after move (atomic editor saves)
+        if os.fsdecode(getattr(event, "dest_path", "")) == self.file_path:
+            self._trigger(event.event_type)
         else:
             self._handle(event)
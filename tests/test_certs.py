@@ -0,0 +1,238 @@
+"""Tests for the certs module."""
+
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from rich.console import Console
+
+import tsm.certs
+from tsm.certs import (
+    CA_CONFIG_TEMPLATE,
+    CryptoSigner,
+    _atomic_write,
+    _fastcopy,
+    _link_or_copy,
+    _parse_mode,
+    copy_certs,
+    generate_certs,
+    generate_certs_from_config,
+    set_file_permissions,
+    template_json,
+)
+
+
+def test_copy_certs(tmp_path):
+    """Test that copy_certs copies cert files and preserves their mode."""
+    from_dir = tmp_path / "from"
+    from_dir.mkdir()
+    (from_dir / "server.pem").write_text("cert")
+    (from_dir / "server-key.pem").write_text("key")
+    (from_dir / "server-key.pem").chmod(0o600)
+    (from_dir / "notes.txt").write_text("ignored")
+    (from_dir / "backup.pem").mkdir()
+
+    to_dir = tmp_path / "to"
+    copy_certs(from_dir, to_dir, Console(quiet=True))
+
+    assert sorted(p.name for p in to_dir.iterdir()) == ["server-key.pem", "server.pem"]
+    assert (to_dir / "server.pem").read_text() == "cert"
+    assert (to_dir / "server-key.pem").stat().st_mode & 0o777 == 0o600
+
+
+def test_copy_certs_empty_dir(tmp_path):
+    """Test copy_certs with no cert files."""
+    from_dir = tmp_path / "from"
+    from_dir.mkdir()
+    to_dir = tmp_path / "to"
+
+    copy_certs(from_dir, to_dir, Console(quiet=True))
+    assert to_dir.exists()
+    assert list(to_dir.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "mode, expected",
+    [
+        (None, 0o644),
+        (0o600, 0o600),
+        ("644", 0o644),
+        ("0640", 0o640),
+        ("0o755", 0o755),
+        ("0O700", 0o700),
+    ],
+)
+def test_parse_mode(mode, expected):
+    """Test permission mode parsing from config values."""
+    assert _parse_mode(mode) == expected
+
+
+def test_atomic_write(tmp_path):
+    """Test that _atomic_write replaces the file and leaves no temp files."""
+    target = tmp_path / "key.pem"
+    target.write_text("old")
+    _atomic_write(target, b"new", 0o600)
+
+    assert target.read_bytes() == b"new"
+    assert target.stat().st_mode & 0o777 == 0o600
+    assert [p.name for p in tmp_path.iterdir()] == ["key.pem"]
+
+
+def test_fastcopy_breaks_hardlinks(tmp_path):
+    """Test that copying onto a hardlinked dst leaves the other link unchanged."""
+    original = tmp_path / "asterisk.pem"
+    original.write_text("generated")
+    linked = tmp_path / "asterisk_fp.pem"
+    os.link(original, linked)
+    prod = tmp_path / "prod.crt"
+    prod.write_text("PROD")
+
+    _fastcopy(prod, linked, 0o600)
+
+    assert original.read_text() == "generated"
+    assert linked.read_text() == "PROD"
+    assert linked.stat().st_mode & 0o777 == 0o600
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "asterisk.pem",
+        "asterisk_fp.pem",
+        "prod.crt",
+    ]
+
+
+def test_prod_copy_keeps_linked_bundle_cert(tmp_path):
+    """Test that overwriting asterisk_fp.pem with a prod cert leaves asterisk.pem intact."""
+    asterisk_dir = tmp_path / "asterisk"
+    asterisk_dir.mkdir()
+    (asterisk_dir / "asterisk.pem").write_text("generated")
+    prod = tmp_path / "asterisk_fp_com.crt"
+    prod.write_text("PROD")
+
+    # generate_bundle, then copy_prod_certs_if_present
+    _link_or_copy(asterisk_dir / "asterisk.pem", tmp_path / "asterisk_fp.pem")
+    _fastcopy(prod, tmp_path / "asterisk_fp.pem", 0o644)
+
+    assert (asterisk_dir / "asterisk.pem").read_text() == "generated"
+    assert (tmp_path / "asterisk_fp.pem").read_text() == "PROD"
+
+
+def test_set_file_permissions_unknown_owner(tmp_path):
+    """Test that an unknown owner/group falls back to the current user and group."""
+    target = tmp_path / "server.pem"
+    target.write_text("cert")
+    set_file_permissions(
+        target, {"mode": "0640", "owner": "no-such-user-tsm", "group": "no-such-group-tsm"}
+    )
+
+    st = target.stat()
+    assert st.st_mode & 0o777 == 0o640
+    assert (st.st_uid, st.st_gid) == (os.getuid(), os.getgid())
+
+
+@pytest.fixture
+def ca_dir(tmp_path):
+    """Create a self-signed CA (ca.pem / ca-key.pem) for signer tests."""
+    pytest.importorskip("cryptography")
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "Test CA")])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + timedelta(days=1))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    (tmp_path / "ca.pem").write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    (tmp_path / "ca-key.pem").write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption(),
+        )
+    )
+    (tmp_path / "ca-config.json").write_bytes(template_json(CA_CONFIG_TEMPLATE))
+    return tmp_path
+
+
+def test_crypto_signer(ca_dir):
+    """Test in-process signing writes a cert chained to the CA with SANs and usages."""
+    from cryptography import x509
+    from cryptography.x509.oid import ExtendedKeyUsageOID, NameOID
+
+    signer = CryptoSigner(ca_dir / "ca.pem", ca_dir / "ca-key.pem", ca_dir / "ca-config.json")
+    csr_data = {
+        "CN": "traefik",
+        "hosts": ["localhost", "127.0.0.1"],
+        "key": {"algo": "ecdsa", "size": 256},
+        "names": [{"C": "US", "O": "etcd"}],
+    }
+    cert_dir = ca_dir / "server"
+    cert_dir.mkdir()
+    signer.sign(csr_data, "client", cert_dir, "server")
+
+    cert = x509.load_pem_x509_certificate((cert_dir / "server.pem").read_bytes())
+    ca = x509.load_pem_x509_certificate((ca_dir / "ca.pem").read_bytes())
+    assert cert.issuer == ca.subject
+    assert cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)[0].value == "traefik"
+    san = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+    assert san.get_values_for_type(x509.DNSName) == ["localhost"]
+    assert [str(ip) for ip in san.get_values_for_type(x509.IPAddress)] == ["127.0.0.1"]
+    eku = cert.extensions.get_extension_for_class(x509.ExtendedKeyUsage).value
+    assert list(eku) == [ExtendedKeyUsageOID.CLIENT_AUTH]
+    assert (cert_dir / "server-key.pem").stat().st_mode & 0o777 == 0o600
+    assert (cert_dir / "server.csr").exists()
+
+
+def test_generate_certs_reuses_valid_cert(ca_dir):
+    """Test that a still-valid cert is kept and a changed host list triggers reissue."""
+    signer = CryptoSigner(ca_dir / "ca.pem", ca_dir / "ca-key.pem", ca_dir / "ca-config.json")
+    console = Console(quiet=True)
+    args = ("server", "web", "web", "localhost,127.0.0.1", ca_dir, ca_dir, "server", "example.com")
+
+    generate_certs(*args, console, signer=signer)
+    pem = ca_dir / "web" / "web.pem"
+    first = pem.read_bytes()
+
+    generate_certs(*args, console, signer=signer)
+    assert pem.read_bytes() == first
+
+    generate_certs(*args[:3], "localhost,web.example.com", *args[4:], console, signer=signer)
+    assert pem.read_bytes() != first
+
+
+def test_generate_certs_from_config_issues_ca_first(tmp_path, monkeypatch):
+    """Test that CA entries are generated before the signer opens and duplicates collapse."""
+    events = []
+
+    @contextmanager
+    def fake_signer(output_dir, cert_config_dir, console):
+        events.append("signer")
+        yield "signer"
+
+    def fake_generate(type, name, *args, signer=None, **kwargs):
+        events.append((name, signer))
+
+    monkeypatch.setattr(tsm.certs, "cert_signer", fake_signer)
+    monkeypatch.setattr(tsm.certs, "generate_certs", fake_generate)
+    config = tmp_path / "certs.yml"
+    config.write_text(
+        "ca:\n  generate: false\n"
+        "certificates:\n"
+        "  - {name: web, type: server}\n"
+        "  - {name: root, type: ca}\n"
+        "  - {name: web, type: server, hosts: example.com}\n"
+    )
+
+    generate_certs_from_config(config, tmp_path / "certs", tmp_path / "config", Console())
+
+    assert events == [("root", None), "signer", ("web", "signer")]
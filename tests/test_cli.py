@@ -1,9 +1,17 @@
 """Tests for the CLI module."""
 
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import click
 import pytest
 from click.testing import CliRunner
 
-from tsm.cli import cli
+import tsm.cli
+from tsm.cli import _bake_images, _discover, cli, discover_services_cached, resolve_path
+from tsm.config import Config
 
 
 @pytest.fixture
@@ -46,3 +54,132 @@ def test_cli_generate_without_file(runner):
     result = runner.invoke(cli, ["generate"])
     # Should fail because no docker-compose.yml exists
     assert result.exit_code != 0
+
+
+def test_discover_services_cached(tmp_path, monkeypatch, sample_compose_file):
+    """Test that discovery results are persisted and reused from TSM_FS_CACHE_DIR."""
+    monkeypatch.setenv("TSM_FS_CACHE_DIR", str(tmp_path / "cache"))
+    _discover.cache_clear()
+
+    services = discover_services_cached(sample_compose_file)
+    assert services
+    assert len(list((tmp_path / "cache").glob("discovery-*.pkl"))) == 1
+
+    _discover.cache_clear()
+    cached = discover_services_cached(sample_compose_file)
+    assert [s.name for s in cached] == [s.name for s in services]
+
+
+def test_compose_file_env_read_at_invocation(runner, monkeypatch, sample_compose_file):
+    """Test that SERVICES_COMPOSE_FILE set after import is honored by discover."""
+    monkeypatch.setenv("SERVICES_COMPOSE_FILE", str(sample_compose_file))
+    monkeypatch.delenv("TSM_FS_CACHE_DIR", raising=False)
+    result = runner.invoke(cli, ["discover"])
+    assert result.exit_code == 0, result.output
+
+
+def test_resolve_path_memoized(tmp_path):
+    """Test that resolve_path caches per base dir within one context."""
+    ctx = click.Context(cli, obj=Config(base_dir=tmp_path))
+    first = resolve_path(ctx, "certs")
+    assert first == (tmp_path / "certs").resolve()
+    assert resolve_path(ctx, "certs") is first
+
+    ctx.obj.base_dir = tmp_path / "other"
+    assert resolve_path(ctx, "certs") == (tmp_path / "other" / "certs").resolve()
+
+
+def test_cli_steps_skips_config(runner, monkeypatch):
+    """Test that info-only commands don't load the config file."""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("config should not be loaded")
+
+    monkeypatch.setattr("tsm.cli.load_config", fail)
+    result = runner.invoke(cli, ["-c", "missing.yml", "steps"])
+    assert result.exit_code == 0
+
+
+def test_init_deploy(runner, tmp_path, monkeypatch, sample_compose_file):
+    """Test that init-deploy runs certs and usersfile, then generates the config."""
+    calls = []
+    monkeypatch.setattr("tsm.certs.generate_certs_from_config", lambda *args: calls.append("certs"))
+    monkeypatch.setattr("tsm.usersfile.generate_usersfile", lambda *args: calls.append("users"))
+    cert_config = tmp_path / "cert-config.yml"
+    cert_config.write_text("certs: []\n")
+
+    result = runner.invoke(
+        cli,
+        [
+            "-d",
+            str(tmp_path),
+            "init-deploy",
+            "--cert-config",
+            str(cert_config),
+            "-u",
+            "admin",
+            "-p",
+            "secret",
+            "-f",
+            str(sample_compose_file),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert sorted(calls) == ["certs", "users"]
+    assert (tmp_path / "config" / "traefik" / "dynamic" / "services.yml").exists()
+
+
+def test_init_deploy_reports_job_exit(runner, tmp_path, monkeypatch, sample_compose_file):
+    """Test that a job calling sys.exit is reported and init-deploy exits non-zero."""
+    calls = []
+
+    def failing_certs(*args):
+        sys.exit(1)
+
+    monkeypatch.setattr("tsm.certs.generate_certs_from_config", failing_certs)
+    monkeypatch.setattr("tsm.usersfile.generate_usersfile", lambda *args: calls.append("users"))
+    cert_config = tmp_path / "cert-config.yml"
+    cert_config.write_text("certs: []\n")
+
+    result = runner.invoke(
+        cli,
+        [
+            "-d",
+            str(tmp_path),
+            "init-deploy",
+            "--cert-config",
+            str(cert_config),
+            "-u",
+            "admin",
+            "-p",
+            "secret",
+            "-f",
+            str(sample_compose_file),
+        ],
+    )
+    assert result.exit_code == 1
+    assert "Certificate generation failed" in result.output
+    assert "Usersfile written" in result.output
+    assert calls == ["users"]
+    assert not (tmp_path / "config" / "traefik" / "dynamic" / "services.yml").exists()
+
+
+@pytest.mark.parametrize(
+    "returncode, expected",
+    [(0, {"web": True, "api": False}), (1, {"web": False, "api": False})],
+)
+def test_bake_images_trusts_metadata_only_on_success(tmp_path, monkeypatch, returncode, expected):
+    """Test that a failing bake marks every image failed, even with metadata written."""
+    images = {"web": tmp_path / "web" / "Dockerfile", "api": tmp_path / "api" / "Dockerfile"}
+    monkeypatch.setattr(
+        tsm.cli.subprocess, "run", lambda *args, **kwargs: SimpleNamespace(returncode=0)
+    )
+
+    def fake_bake(command):
+        metadata_file = Path(command[command.index("--metadata-file") + 1])
+        metadata_file.write_text(json.dumps({"web": {}}))
+        return returncode
+
+    monkeypatch.setattr(tsm.cli, "_run_streaming", fake_bake)
+
+    assert _bake_images(images, "tsm-", tmp_path, no_cache=False) == expected
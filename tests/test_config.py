@@ -1,5 +1,8 @@
 """Tests for the config module."""
 
+import pytest
+from pydantic import ValidationError
+
 from tsm.config import Config, load_config
 
 
@@ -37,3 +40,39 @@ output_directory: test/output
     config = load_config(str(config_file))
     assert config.environment == "production"
     assert config.output_directory == "test/output"
+
+
+def test_load_config_cache(tmp_path):
+    """Test that cached loads return independent objects and pick up edits."""
+    config_file = tmp_path / "config.yml"
+    config_file.write_text("environment: production\n")
+
+    first = load_config(config_file)
+    first.base_dir = tmp_path / "elsewhere"
+    second = load_config(config_file)
+    assert second is not first
+    assert second.base_dir != first.base_dir
+
+    config_file.write_text("environment: staging\nlog_level: DEBUG\n")
+    assert load_config(config_file).environment == "staging"
+
+
+def test_config_shares_frozen_defaults():
+    """Test that default sub-configs are shared, frozen instances."""
+    first, second = Config(), Config()
+    assert first.docker is second.docker
+    assert first.traefik is not second.traefik
+
+    with pytest.raises(ValidationError):
+        first.docker.timeout = 5
+
+    custom = Config(docker={"timeout": 5})
+    assert custom.docker.timeout == 5
+    assert Config().docker.timeout == 60
+
+
+def test_get_service_scaling_config():
+    """Test per-service scaling config with a default for unlisted services."""
+    config = Config(services={"web": {"min_replicas": 2}})
+    assert config.get_service_scaling_config("web").min_replicas == 2
+    assert config.get_service_scaling_config("api").min_replicas == 1
@@ -1,5 +1,8 @@
 """Tests for the discovery module."""
 
+import pytest
+from pydantic import ValidationError
+
 from tsm.discovery import Service, ServiceDiscovery
 
 
@@ -97,3 +100,137 @@ services:
     service_names = [s.name for s in services]
     assert "web" in service_names
     assert "api" in service_names
+
+
+def test_discover_names(tmp_path, sample_compose_file):
+    """Test that discover_names matches the names from a full discovery."""
+    discovery = ServiceDiscovery()
+    expected = {s.name for s in discovery.discover_services(sample_compose_file)}
+    assert discovery.discover_names(sample_compose_file) == expected
+
+    empty = tmp_path / "docker-compose.yml"
+    empty.write_text("version: '3.8'\n")
+    assert discovery.discover_names(empty) == set()
+
+
+def test_discover_services_trusted_input(monkeypatch, sample_compose_file):
+    """Test that TSM_TRUST_INPUT builds the same services without validation."""
+    validated = ServiceDiscovery().discover_services(sample_compose_file)
+
+    monkeypatch.setenv("TSM_TRUST_INPUT", "1")
+    trusted = ServiceDiscovery().discover_services(sample_compose_file)
+
+    assert trusted == validated
+
+
+def test_discover_services_reparses_on_change(tmp_path):
+    """Test that the parsed compose cache is invalidated when the file changes."""
+    compose_file = tmp_path / "docker-compose.yml"
+    compose_file.write_text("services:\n  web:\n    image: nginx\n")
+    discovery = ServiceDiscovery()
+
+    first = discovery.discover_services(compose_file)
+    first[0].labels["mutated"] = "yes"
+    assert discovery.discover_services(compose_file)[0].labels == {}
+
+    compose_file.write_text("services:\n  web:\n    image: nginx\n  api:\n    image: python\n")
+    assert discovery.discover_names(compose_file) == {"web", "api"}
+
+
+def test_parse_scaling_labels():
+    """Test that tsm.scaling.* labels are coerced into a ScalingConfig."""
+    config = ServiceDiscovery()._parse_scaling_labels(
+        {
+            "tsm.scaling.enabled": "true",
+            "tsm.scaling.min_replicas": "2",
+            "tsm.scaling.target_cpu": "55.5",
+            "tsm.scaling.priority": "high",
+            "tsm.scaling.max_replicas": "many",
+            "traefik.enable": "true",
+        }
+    )
+    assert config.min_replicas == 2
+    assert config.max_replicas == 10
+    assert config.target_cpu == 55.5
+    assert config.priority == "high"
+    assert ServiceDiscovery()._parse_scaling_labels({"tsm.scaling.min_replicas": "2"}) is None
+
+
+def test_service_domain_names():
+    """Test that Host and HostRegexp domains are extracted in rule order and stay in sync."""
+    service = Service(
+        name="web",
+        image="nginx",
+        ports=[],
+        networks=[],
+        labels={},
+        volumes=[],
+        environment={},
+        depends_on=[],
+        traefik_rule="Host(`a.example.com`) || HostRegexp(`{sub:.+}.example.com`) || Host('b.dev')",
+    )
+    assert service.domain_names == ["a.example.com", "{sub:.+}.example.com", "b.dev"]
+
+    with pytest.raises(ValidationError):
+        service.traefik_rule = "Host(`c.example.com`)"
+    assert service.domain_names == ["a.example.com", "{sub:.+}.example.com", "b.dev"]
+
+
+def test_service_traefik_labels():
+    """Test that Traefik labels are bucketed by kind in label order."""
+    service = Service(
+        name="db",
+        image="postgres",
+        ports=[],
+        networks=[],
+        labels={
+            "traefik.http.services.db.loadbalancer.server.address": "10.0.0.2:5432",
+            "traefik.http.services.db_service.loadbalancer.server.port": "5432",
+            "traefik.tcp.routers.db.entrypoints": "postgres",
+            "traefik.tcp.routers.db": "",
+            "traefik.tcp.services.db.loadbalancer.server.port": "5432",
+            "com.example.other": "x",
+        },
+        volumes=[],
+        environment={},
+        depends_on=[],
+    )
+    labels = service.traefik_labels
+    assert labels.is_tcp
+    assert labels.http_addresses == {
+        "traefik.http.services.db.loadbalancer.server.address": "10.0.0.2:5432"
+    }
+    assert labels.http_ports == [
+        ("traefik.http.services.db_service.loadbalancer.server.port", "5432")
+    ]
+    assert labels.tcp_routers == [("db", "entrypoints", "postgres"), ("db", None, "")]
+    assert labels.tcp_services == [("db", "loadbalancer.server.port", "5432")]
+    assert service.traefik_labels is labels
+
+
+def test_get_services_by_network():
+    """Test grouping service names by network."""
+
+    def service(name, networks):
+        return Service(
+            name=name,
+            image="nginx",
+            ports=[],
+            networks=networks,
+            labels={},
+            volumes=[],
+            environment={},
+            depends_on=[],
+        )
+
+    services = [service("web", ["front", "back"]), service("db", ["back"])]
+    assert ServiceDiscovery().get_services_by_network(services) == {
+        "front": ["web"],
+        "back": ["web", "db"],
+    }
+
+
+def test_parse_environment_list():
+    """Test list-form environment parsing keeps values after the first '='."""
+    env = ServiceDiscovery()._parse_environment(["A=1", "FLAG", "URL=a=b", "EMPTY="])
+    assert env == {"A": "1", "URL": "a=b", "EMPTY": ""}
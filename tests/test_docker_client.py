@@ -0,0 +1,273 @@
+"""Tests for the docker_client module."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from docker.errors import APIError, NotFound
+
+import tsm.docker_client
+from tsm.docker_client import DockerManager, compose_command
+
+
+def _sample(total_usage, system_usage, pre_total, pre_system):
+    return {
+        "name": "/web-1",
+        "read": "2024-01-01T00:00:00Z",
+        "cpu_stats": {
+            "cpu_usage": {"total_usage": total_usage, "percpu_usage": [0, 0]},
+            "system_cpu_usage": system_usage,
+        },
+        "precpu_stats": {
+            "cpu_usage": {"total_usage": pre_total},
+            "system_cpu_usage": pre_system,
+        },
+        "memory_stats": {"usage": 50, "limit": 200},
+        "networks": {"eth0": {"rx_bytes": 10, "tx_bytes": 20}},
+    }
+
+
+class FakeAPI:
+    def __init__(self, samples):
+        self.samples = samples
+        self.calls = []
+
+    def stats(self, container_id, stream=False, decode=False, **kwargs):
+        self.calls.append((container_id, stream, decode))
+        # Split the newline-delimited stream across chunk boundaries
+        body = b"".join(json.dumps(sample).encode() + b"\n" for sample in self.samples)
+        return (body[i : i + 100] for i in range(0, len(body), 100))
+
+    def _url(self, path, *args):
+        return path.format(*args)
+
+    def _get(self, url, params=None):
+        self.calls.append((url, params))
+        return json.dumps(self.samples.pop(0)).encode()
+
+    def _result(self, response, binary=False):
+        return response
+
+
+class FakeClient:
+    def __init__(self, api):
+        self.api = api
+
+    def ping(self):
+        return True
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    # The first streamed sample has no CPU baseline yet, as with dockerd
+    api = FakeAPI([_sample(100, 1000, 0, 0), _sample(300, 2000, 100, 1000)])
+    monkeypatch.setattr(tsm.docker_client, "get_docker_client", lambda: FakeClient(api))
+    return api
+
+
+def test_get_container_metrics_streams_stats(fake_api):
+    """Test that metrics come from the streamed sample carrying a CPU baseline."""
+    manager = DockerManager()
+    metrics = manager.get_container_metrics("abc123")
+
+    assert fake_api.calls == [("abc123", True, False)]
+    assert metrics.name == "web-1"
+    assert metrics.cpu_percent == pytest.approx(40.0)
+    assert metrics.memory_percent == pytest.approx(25.0)
+    assert (metrics.network_rx_bytes, metrics.network_tx_bytes) == (10, 20)
+    manager.stop_stats_streams()
+    assert manager._stats_streams == {}
+
+
+def test_get_container_metrics_one_shot(fake_api):
+    """Test that one-shot reads compute CPU against the previous local sample."""
+    fake_api.samples = [_sample(100, 1000, 0, 0), _sample(300, 2000, 0, 0)]
+    manager = DockerManager()
+
+    assert manager.get_container_metrics("abc123", stream=False).cpu_percent == 0.0
+    assert manager.get_container_metrics("abc123", stream=False).cpu_percent == pytest.approx(40.0)
+    params = {"stream": False, "one-shot": True}
+    assert fake_api.calls == [("/containers/abc123/stats", params)] * 2
+    manager.stop_stats_streams()
+    assert manager._prev_cpu == {}
+
+
+def test_get_container_metrics_caps_live_streams(fake_api, monkeypatch):
+    """Test that containers past MAX_STATS_STREAMS are read one-shot, not streamed."""
+    monkeypatch.setattr(tsm.docker_client, "MAX_STATS_STREAMS", 1)
+    fake_api.samples = [_sample(100, 1000, 0, 0), _sample(300, 2000, 100, 1000)]
+    manager = DockerManager()
+    manager._stats_streams["other"] = SimpleNamespace(alive=True, stop=lambda: None)
+
+    assert manager.get_container_metrics("abc123").cpu_percent == 0.0
+    assert fake_api.calls == [("/containers/abc123/stats", {"stream": False, "one-shot": True})]
+    assert list(manager._stats_streams) == ["other"]
+
+
+def test_get_service_metrics_keeps_container_order(fake_api, monkeypatch):
+    """Test that metrics are read concurrently for running containers only, in order."""
+    manager = DockerManager()
+    containers = [("a", "running"), ("b", "exited"), ("c", "running"), ("d", "running")]
+    monkeypatch.setattr(manager, "_service_container_states", lambda name: containers)
+    monkeypatch.setattr(
+        manager, "get_container_metrics", lambda cid: None if cid == "d" else cid.upper()
+    )
+
+    assert manager.get_service_metrics("web") == ["A", "C"]
+
+
+def _summary(cid, service, state, ports=()):
+    """Build a /containers/json entry as returned by api.containers()."""
+    return {
+        "Id": cid * 12,
+        "Names": [f"/{cid}"],
+        "Image": "img:latest",
+        "Labels": {"com.docker.compose.service": service} if service else {},
+        "State": state,
+        "Status": "Up 1 minute" if state == "running" else "Exited (0)",
+        "Ports": list(ports),
+        "Created": 0,
+        "NetworkSettings": {"Networks": {"proxy": {}}},
+    }
+
+
+def test_list_containers_cached(fake_api):
+    """Test that container listings are reused within the TTL and refetched after invalidation."""
+    manager = DockerManager()
+    calls = []
+
+    def containers(all=False, filters=None):
+        calls.append((all, filters))
+        return [_summary("a", "web", "running"), _summary("b", "db", "exited")]
+
+    fake_api.containers = containers
+
+    assert manager.get_running_services() == ["web"]
+    assert manager.get_running_services() == ["web"]
+    assert calls == [(True, {"label": "com.docker.compose.service"})]
+
+    manager.invalidate_container_cache()
+    manager.get_running_services()
+    assert len(calls) == 2
+
+
+def test_get_all_service_statuses_groups_one_listing(fake_api):
+    """Test that statuses for all services come from one grouped container listing."""
+    manager = DockerManager()
+    calls = []
+    containers = [
+        _summary(
+            "a",
+            "web",
+            "running",
+            ports=[
+                {"IP": "0.0.0.0", "PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"},
+                {"PrivatePort": 443, "Type": "tcp"},
+            ],
+        ),
+        {**_summary("b", "db", "exited"), "Image": "sha256:" + "0" * 64},
+        _summary("c", "web", "exited"),
+        _summary("d", None, "running"),
+    ]
+    fake_api.containers = lambda **kwargs: calls.append(1) or containers
+
+    statuses = manager.get_all_service_statuses()
+    assert list(statuses) == ["web", "db"]
+    assert statuses["web"].health_status == "degraded"
+    assert statuses["web"].ports == [8080]
+    assert statuses["db"].health_status == "unhealthy"
+    assert list(manager.get_all_service_statuses(["db", "missing"])) == ["db"]
+
+    info = manager.get_service_containers("web")[0]
+    assert (info.name, info.status, info.state) == ("a", "running", "running")
+    assert (info.image, info.networks) == ("img:latest", ["proxy"])
+    assert manager.get_service_containers("db")[0].image == "unknown"
+    assert info.ports == {
+        "80/tcp": [{"HostIp": "0.0.0.0", "HostPort": "8080"}],
+        "443/tcp": None,
+    }
+    assert calls == [1]
+
+
+def test_get_compose_services_parses_locally(fake_api, tmp_path, monkeypatch):
+    """Test that compose services are read from the file, deferring to compose for extends."""
+    manager = DockerManager()
+    compose = tmp_path / "docker-compose.yml"
+    compose.write_text("services:\n  web:\n    image: nginx\n  db:\n    image: postgres\n")
+    monkeypatch.setattr(manager, "_compose_config_services", lambda path: ["resolved"])
+
+    assert manager.get_compose_services(compose) == ["web", "db"]
+
+    compose.write_text(
+        "services:\n  web:\n    extends:\n      file: base.yml\n      service: web\n"
+    )
+    assert manager.get_compose_services(compose) == ["resolved"]
+    assert manager.get_compose_services(tmp_path / "missing.yml") == []
+
+
+def test_compose_command_resolved_once(monkeypatch):
+    """Test that the compose CLI falls back to the docker plugin and is probed only once."""
+    runs = []
+    monkeypatch.setattr(tsm.docker_client.shutil, "which", lambda name: None)
+    monkeypatch.setattr(
+        tsm.docker_client.subprocess,
+        "run",
+        lambda cmd, **kwargs: runs.append(cmd) or SimpleNamespace(returncode=0),
+    )
+    compose_command.cache_clear()
+    try:
+        assert compose_command() == ("docker", "compose")
+        assert compose_command() == ("docker", "compose")
+        assert runs == [["docker", "compose", "version"]]
+    finally:
+        compose_command.cache_clear()
+
+
+def test_create_networks_creates_missing_only(fake_api):
+    """Test that only networks the daemon does not know about are created."""
+    manager = DockerManager()
+    created = []
+
+    def get(name):
+        if name != "proxy":
+            raise NotFound(name)
+
+    manager.client.networks = SimpleNamespace(
+        get=get, create=lambda name, driver: created.append((name, driver))
+    )
+    manager.create_networks(["proxy", "backend", "monitoring"])
+
+    assert sorted(created) == [("backend", "bridge"), ("monitoring", "bridge")]
+
+
+def test_clean_system_reports_every_prune_failure(fake_api):
+    """Test that one failing pruner does not stop the others and all failures are raised."""
+    manager = DockerManager()
+    pruned = []
+
+    def pruner(kind, fails=False):
+        def prune():
+            pruned.append(kind)
+            if fails:
+                raise APIError(f"{kind} busy")
+
+        return SimpleNamespace(prune=prune)
+
+    manager.client.containers = pruner("containers")
+    manager.client.images = pruner("images", fails=True)
+    manager.client.networks = pruner("networks")
+    manager.client.volumes = pruner("volumes", fails=True)
+
+    with pytest.raises(RuntimeError, match="images: .*volumes: "):
+        manager.clean_system()
+    assert pruned[0] == "containers"
+    assert sorted(pruned[1:]) == ["images", "networks", "volumes"]
+
+
+def test_metrics_from_stats_prefers_online_cpus():
+    """Test that online_cpus is used over percpu_usage, which cgroup v2 hosts omit."""
+    stats = _sample(300, 2000, 100, 1000)
+    stats["cpu_stats"]["online_cpus"] = 4
+    del stats["cpu_stats"]["cpu_usage"]["percpu_usage"]
+
+    assert DockerManager._metrics_from_stats("abc123", stats).cpu_percent == pytest.approx(80.0)
@@ -0,0 +1,69 @@
+"""Tests for the scaling module."""
+
+from types import SimpleNamespace
+
+from tsm.scaling import AutoScaler
+
+
+class FakeDockerManager:
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.scaled = []
+
+    def get_all_service_statuses(self, service_names):
+        list(service_names)
+        return self.statuses
+
+    def is_swarm_mode(self):
+        return False
+
+    def scale_compose_service(self, name, replicas, compose_file):
+        self.scaled.append((name, replicas))
+
+
+class FakePrometheus:
+    def __init__(self, cpu):
+        self.cpu = cpu
+
+    def get_cpu(self, name, query):
+        return self.cpu
+
+    def get_memory(self, name, query):
+        return None
+
+
+def _write_compose(tmp_path):
+    compose = tmp_path / "docker-compose.yml"
+    compose.write_text(
+        "services:\n"
+        "  web:\n"
+        "    image: nginx\n"
+        "    deploy:\n"
+        "      labels:\n"
+        "        tsm.scaling.enabled: 'true'\n"
+        "        tsm.scaling.min_replicas: '2'\n"
+        "        tsm.scaling.max_replicas: '5'\n"
+    )
+    return compose
+
+
+def test_check_and_scale_skips_service_without_status(tmp_path):
+    """Test that a scalable service with no containers is left alone."""
+    manager = FakeDockerManager({})
+    scaler = AutoScaler(
+        manager, FakePrometheus(cpu=0.0), tmp_path / "missing.yml", _write_compose(tmp_path)
+    )
+    scaler._check_and_scale()
+
+    assert manager.scaled == []
+
+
+def test_check_and_scale_scales_up(tmp_path):
+    """Test that a busy service is scaled up by one replica."""
+    manager = FakeDockerManager({"web": SimpleNamespace(replicas=2)})
+    scaler = AutoScaler(
+        manager, FakePrometheus(cpu=99.0), tmp_path / "missing.yml", _write_compose(tmp_path)
+    )
+    scaler._check_and_scale()
+
+    assert manager.scaled == [("web", 3)]
@@ -1,6 +1,20 @@
 """Tests for the utils module."""
 
-from tsm.utils import ensure_directory, merge_dicts, validate_domain, validate_port
+import logging
+import sys
+
+import yaml
+from loguru import logger
+
+from tsm.utils import (
+    YamlDumper,
+    YamlLoader,
+    ensure_directory,
+    merge_dicts,
+    setup_logging,
+    validate_domain,
+    validate_port,
+)
 
 
 def test_ensure_directory(tmp_path):
@@ -61,3 +75,29 @@ def test_merge_dicts_nested():
 
     result = merge_dicts(dict1, dict2)
     assert result == {"a": {"x": 1, "y": 3, "z": 4}}
+
+
+def test_yaml_uses_libyaml_when_available():
+    """Test that the C loader/dumper are used when libyaml is built in, else the pure ones."""
+    if yaml.__with_libyaml__:
+        assert (YamlLoader, YamlDumper) == (yaml.CSafeLoader, yaml.CSafeDumper)
+    else:
+        assert (YamlLoader, YamlDumper) == (yaml.SafeLoader, yaml.SafeDumper)
+
+
+def test_setup_logging_routes_stdlib(tmp_path, monkeypatch):
+    """Test that stdlib log records reach loguru, filtered at the configured level."""
+    monkeypatch.chdir(tmp_path)
+    setup_logging("INFO", log_files=False)
+    messages = []
+    logger.add(messages.append, level="DEBUG", format="{level} {message}")
+    try:
+        logging.getLogger("docker").debug("hidden")
+        logging.getLogger("docker").warning("pull failed")
+    finally:
+        logger.remove()
+        logger.add(sys.stderr)
+        logging.basicConfig(force=True)
+
+    assert [m.strip() for m in messages] == ["WARNING pull failed"]
+    assert not (tmp_path / "logs").exists()
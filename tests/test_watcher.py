@@ -0,0 +1,28 @@
+"""Tests for the watcher module."""
+
+import threading
+
+from watchdog.events import FileModifiedEvent, FileMovedEvent
+
+from tsm.watcher import _FileChangeHandler
+
+
+def test_file_change_handler_debounces(tmp_path):
+    """Test that a burst of events for the watched file fires the callback once."""
+    target = tmp_path / "docker-compose.yml"
+    fired = threading.Event()
+    calls = []
+
+    def callback():
+        calls.append(1)
+        fired.set()
+
+    handler = _FileChangeHandler(target, callback, debounce=0.05)
+    handler.on_modified(FileModifiedEvent(str(tmp_path / "other.yml")))
+    for _ in range(5):
+        handler.on_modified(FileModifiedEvent(str(target)))
+    handler.on_moved(FileMovedEvent(str(tmp_path / ".swp"), str(target)))
+
+    assert fired.wait(2)
+    handler.cancel()
+    assert calls == [1]